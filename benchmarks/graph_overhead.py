@@ -0,0 +1,87 @@
+# benchmarks/graph_overhead.py — Per-invocation and startup overhead: LangGraph vs native executor
+#
+#   python -m benchmarks.graph_overhead --iterations 2000
+#
+# LLM calls go to the in-process mock with zero latency, so the numbers are the
+# pipeline's own cost (scheduling, state merging, node bodies), not the model's.
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ["LLM_BACKEND"] = "mock"
+os.environ["MOCK_LLM_LATENCY"] = "fixed:0"
+
+STATE = {
+    "transcript": "I just had an accident, my policy is CAR 100001 and my name is Rajesh Kumar",
+    "is_finalized": True,
+    "intent": None,
+    "claim_type": None,
+    "entities": None,
+    "member_data": None,
+    "knowledge_docs": None,
+    "compliance_alerts": None,
+    "suggestion": None,
+}
+
+STARTUP_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from graph.graph import build_graph; build_graph({backend!r}); "
+    "print(time.perf_counter() - t)"
+)
+
+
+async def time_invocations(graph, iterations: int) -> list[float]:
+    for _ in range(min(iterations // 10, 100)):  # warm-up
+        await graph.ainvoke(STATE)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await graph.ainvoke(STATE)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_startup(backend: str, runs: int) -> list[float]:
+    """Import + build in a fresh interpreter, as a new worker would."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET.format(backend=backend)],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def _ms(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare graph backends with LLM calls stubbed out.")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from graph.graph import build_graph
+
+    print(f"{'backend':<10} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'startup ms':>11}")
+    for backend in ("langgraph", "native"):
+        samples = asyncio.run(time_invocations(build_graph(backend), args.iterations))
+        startup = time_startup(backend, args.startup_runs)
+        print(
+            f"{backend:<10} {statistics.mean(samples) * 1e6:>9.0f} "
+            f"{_ms(samples, 0.5) * 1000:>9.0f} {_ms(samples, 0.99) * 1000:>9.0f} "
+            f"{statistics.median(startup) * 1000:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/import_budget.py — Import-time budget check for `import main` (python -X importtime)
+#
+#   python -m benchmarks.import_budget                 # exit 1 if over budget
+#   IMPORT_BUDGET_MS=350 python -m benchmarks.import_budget --runs 7
+#
+# Fails when the best-of-N cumulative import time of `main` exceeds the budget, or
+# when a dependency that should load lazily (after the server is live) shows up
+# on the import path.
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Loaded by the background warm-up or on first use, never by `import main`
+LAZY_MODULES = ("openai", "langgraph", "httpx")
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """(cumulative µs, depth, module) for every line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return rows
+
+
+def measure(module: str) -> list[tuple[int, int, str]]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(out.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the server module.")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5, help="take the best of N fresh interpreters")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "500")))
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest direct imports")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    best = min(runs, key=lambda rows: next(c for c, d, n in rows if n == args.module))
+    total_ms = next(c for c, d, n in best if n == args.module) / 1000
+
+    print(f"import {args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms, best of {len(runs)})")
+    for cumulative, _, name in sorted((r for r in best if r[1] == 1), reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:>7.1f} ms  {name}")
+
+    loaded = {name.split(".")[0] for _, _, name in best}
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    if eager:
+        print(f"FAIL: imported eagerly, should be lazy: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        print("FAIL: over budget")
+    return 1 if eager or total_ms > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
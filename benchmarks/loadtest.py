@@ -0,0 +1,102 @@
+# benchmarks/loadtest.py — Local WebSocket load test for /stream admission control
+#
+# 1. Start the mock LLM (or use LLM_BACKEND=mock on the server):
+#       MOCK_LLM_LATENCY="lognormal:400:0.5" python -m tools.mock_server
+# 2. Start a worker with tight limits so they are easy to hit:
+#       OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=mock \
+#       MAX_CONCURRENT_CALLS=50 MAX_CONCURRENT_SLOW_PATH=8 uvicorn main:app --port 8000
+# 3. Run:
+#       python -m benchmarks.loadtest --calls 80 --utterances 8
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import websockets
+
+SCRIPT = [
+    ("Guest-1", "Thank you for calling Super Insurance claims. This call is recorded for quality purposes."),
+    ("Guest-2", "Hi, I just got into an accident. Someone rear-ended my car at a stoplight."),
+    ("Guest-1", "I'm so sorry to hear that. Are you okay?"),
+    ("Guest-2", "We're both okay. My policy number is CAR 100001."),
+    ("Guest-1", "Thank you Rajesh. Have you called the police to file an accident report?"),
+    ("Guest-2", "Not yet, the other guy said it was completely his fault."),
+    ("Guest-1", "Please don't admit fault to anyone, and do file a police report."),
+    ("Guest-2", "My car is not drivable, can you send a tow truck?"),
+]
+
+
+async def run_call(url: str, utterances: int, pause: float, results: dict):
+    try:
+        async with websockets.connect(url) as ws:
+            for i in range(utterances):
+                speaker, text = SCRIPT[i % len(SCRIPT)]
+                sent = time.perf_counter()
+                await ws.send(json.dumps({
+                    "text": text, "is_finalized": True, "speaker": speaker, "offset": (i + 1) * 50_000_000,
+                }))
+                full = False
+                while True:
+                    msg = json.loads(await ws.recv())
+                    full = full or msg["type"] == "suggestion"
+                    if msg["type"] == "transcript":
+                        break
+                results["latency"].append(time.perf_counter() - sent)
+                results["full" if full else "degraded"] += 1
+                await asyncio.sleep(pause)
+            results["completed"] += 1
+    except websockets.ConnectionClosedError as e:
+        results["rejected" if e.rcvd and e.rcvd.code == 1013 else "errors"] += 1
+    except Exception:
+        results["errors"] += 1
+
+
+async def poll_health(base: str, samples: list, stop: asyncio.Event):
+    async with httpx.AsyncClient() as client:
+        while not stop.is_set():
+            try:
+                samples.append((await client.get(f"{base}/health")).json().get("load", {}))
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+
+
+async def main(args):
+    results = {"latency": [], "full": 0, "degraded": 0, "completed": 0, "rejected": 0, "errors": 0}
+    health: list[dict] = []
+    stop = asyncio.Event()
+    poller = asyncio.create_task(poll_health(args.http, health, stop))
+
+    started = time.perf_counter()
+    calls = []
+    for _ in range(args.calls):
+        calls.append(asyncio.create_task(run_call(args.url, args.utterances, args.pause, results)))
+        await asyncio.sleep(args.ramp / max(args.calls, 1))
+    await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await poller
+
+    lat = sorted(results["latency"])
+    pct = lambda p: lat[min(int(p * len(lat)), len(lat) - 1)] * 1000 if lat else 0.0
+    print(f"Calls: {results['completed']} completed, {results['rejected']} rejected, {results['errors']} errors in {elapsed:.1f}s")
+    print(f"Utterances: {results['full']} full slow path, {results['degraded']} degraded")
+    if lat:
+        print(f"Utterance latency ms: p50={pct(0.5):.0f} p95={pct(0.95):.0f} p99={pct(0.99):.0f} mean={statistics.mean(lat) * 1000:.0f}")
+    if health:
+        print(f"Peak load: {max(h.get('active_calls', 0) for h in health)} calls, "
+              f"{max(h.get('slow_path_in_flight', 0) for h in health)} slow-path runs in flight")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-call load test for /stream.")
+    parser.add_argument("--url", default="ws://localhost:8000/stream")
+    parser.add_argument("--http", default="http://localhost:8000")
+    parser.add_argument("--calls", type=int, default=50, help="concurrent simulated calls")
+    parser.add_argument("--utterances", type=int, default=8, help="finalized utterances per call")
+    parser.add_argument("--pause", type=float, default=0.5, help="seconds between utterances")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds to open all calls")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,167 @@
+# benchmarks/name_index.py — Fuzzy name lookup over a large synthetic member base
+#
+#   python -m benchmarks.name_index --members 1000000 --queries 2000
+#
+# Builds the index over synthetic Indian-style names, then looks up names with
+# ASR-style corruption (vowel slips, sh/s, v/w, dropped or swapped letters) and
+# reports NameIndex.search latency and recall, end-to-end get_member latency for
+# exact and misheard names over the same members, and the cost of a linear
+# scan over every member name (substring or fuzzy) for comparison.
+
+import argparse
+import random
+import resource
+import statistics
+import time
+
+from data import members as member_db
+from data.name_index import NameIndex, edit_distance, member_name_index, tokenize
+
+ONSETS = ["r", "p", "k", "v", "s", "m", "n", "a", "d", "b", "g", "h", "j", "l", "t", "sh", "bh", "ch", "pr", "kr", "sr"]
+NUCLEI = ["a", "aa", "e", "ee", "i", "o", "u", "ai"]
+CODAS = ["", "", "n", "m", "r", "sh", "j", "t", "l", "sh", "nd", "v", "k"]
+VOWEL_SLIPS = {"a": "e", "e": "i", "i": "e", "o": "u", "u": "oo", "aa": "a", "ee": "i"}
+SOUND_SLIPS = (("sh", "s"), ("v", "w"), ("w", "v"), ("ph", "f"), ("z", "j"), ("ee", "i"), ("kh", "k"))
+
+
+def _word(rng: random.Random, syllables: int) -> str:
+    return "".join(rng.choice(ONSETS) + rng.choice(NUCLEI) + rng.choice(CODAS) for _ in range(syllables)).capitalize()
+
+
+def synthetic_names(rng: random.Random, count: int, first_names: int, surnames: int) -> list[tuple[str, str]]:
+    firsts = list({_word(rng, rng.choice((2, 2, 3))) for _ in range(first_names)})
+    lasts = list({_word(rng, rng.choice((1, 2, 2, 3))) for _ in range(surnames)})
+    return [(f"CAR-{i:07d}", f"{rng.choice(firsts)} {rng.choice(lasts)}") for i in range(count)]
+
+
+def mishear(rng: random.Random, name: str) -> str:
+    """One or two ASR-style slips somewhere in the name."""
+    text = name.lower()
+    for _ in range(rng.choice((1, 1, 2))):
+        kind = rng.random()
+        if kind < 0.35:
+            src, dst = rng.choice([(s, d) for s, d in SOUND_SLIPS if s in text] or [("a", "e")])
+            text = text.replace(src, dst, 1)
+        elif kind < 0.65:
+            positions = [i for i, ch in enumerate(text) if ch in VOWEL_SLIPS]
+            if positions:
+                i = rng.choice(positions)
+                text = text[:i] + VOWEL_SLIPS[text[i]] + text[i + 1:]
+        elif kind < 0.85:
+            positions = [i for i in range(1, len(text) - 1) if text[i] != " " and text[i + 1] != " "]
+            if positions:
+                i = rng.choice(positions)
+                text = text[:i] + text[i + 1] + text[i] + text[i + 2:]
+        else:
+            positions = [i for i in range(1, len(text)) if text[i] != " " and text[i - 1] != " "]
+            if positions:
+                i = rng.choice(positions)
+                text = text[:i] + text[i + 1:]
+    return text.title()
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def linear_substring(members: list[tuple[str, str]], query: str) -> str | None:
+    """A linear scan: substring test against every member name."""
+    q = query.lower()
+    for pid, name in members:
+        if q in name.lower():
+            return pid
+    return None
+
+
+def linear_fuzzy(members: list[tuple[str, str]], query: str) -> str | None:
+    """A naive fuzzy scan: bounded edit distance against every member name."""
+    q = " ".join(tokenize(query))
+    best = None
+    for pid, name in members:
+        if edit_distance(q, name.lower(), 3) <= 3:
+            best = pid
+            break
+    return best
+
+
+def _latency(samples: list[float]) -> str:
+    samples = sorted(samples)
+    return (
+        f"p50 {samples[len(samples) // 2] * 1e6:.0f} µs  "
+        f"p99 {samples[int(len(samples) * 0.99)] * 1e6:.0f} µs  "
+        f"mean {statistics.mean(samples) * 1e6:.0f} µs"
+    )
+
+
+def bench_get_member(rng: random.Random, members: list[tuple[str, str]], queries: int) -> None:
+    """get_member over the synthetic members, with the real MEMBER_DB swapped out."""
+    saved = dict(member_db.MEMBER_DB)
+    member_db.MEMBER_DB.clear()
+    member_db.MEMBER_DB.update(
+        (pid, {"policyId": pid, "name": name, "phone": f"+91 9{i:09d}"}) for i, (pid, name) in enumerate(members)
+    )
+    member_name_index.cache_clear()
+    try:
+        started = time.perf_counter()
+        member_name_index()
+        print(f"get_member index build {time.perf_counter() - started:.1f}s")
+        for label, corrupt in (("exact", False), ("misheard", True)):
+            samples = []
+            for _ in range(queries):
+                _, truth = rng.choice(members)
+                query = mishear(rng, truth) if corrupt else truth
+                t = time.perf_counter()
+                member_db.get_member(name=query)
+                samples.append(time.perf_counter() - t)
+            print(f"get_member {label:<9} {_latency(samples)}")
+    finally:
+        member_db.MEMBER_DB.clear()
+        member_db.MEMBER_DB.update(saved)
+        member_name_index.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy/phonetic member name index benchmark.")
+    parser.add_argument("--members", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--first-names", type=int, default=4000)
+    parser.add_argument("--surnames", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    members = synthetic_names(rng, args.members, args.first_names, args.surnames)
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    index = NameIndex.build(members)
+    build_s = time.perf_counter() - started
+    print(f"built index over {len(index):,} members in {build_s:.1f}s (peak RSS +{_rss_mb() - rss_before:.0f} MB)")
+
+    samples, top1, top5 = [], 0, 0
+    for _ in range(args.queries):
+        _, truth = rng.choice(members)
+        heard = mishear(rng, truth)
+        t = time.perf_counter()
+        results = index.search(heard)
+        samples.append(time.perf_counter() - t)
+        names = [r["name"] for r in results]
+        top1 += bool(names) and names[0] == truth
+        top5 += truth in names
+
+    print(f"search: {_latency(samples)}")
+    print(f"recall: top-1 {top1 / args.queries:.1%}  top-5 {top5 / args.queries:.1%}")
+
+    del index
+    bench_get_member(rng, members, args.queries)
+
+    _, truth = members[-1]
+    query = mishear(rng, truth)
+    for label, scan in (("linear substring", linear_substring), ("linear fuzzy", linear_fuzzy)):
+        t = time.perf_counter()
+        hit = scan(members, query)
+        print(f"{label:<17} one lookup: {(time.perf_counter() - t) * 1000:.0f} ms (found: {hit is not None})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/startup.py — Worker cold-start benchmark: process spawn → live → ready
+#
+#   python -m benchmarks.startup --runs 5
+#
+# Starts a fresh uvicorn worker per run (throwaway archive, placeholder API key —
+# building the OpenAI client makes no request) and polls /health/live and
+# /health/ready to time when each first answers 200.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+
+def _ok(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=0.5) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return False
+
+
+def run_once(port: int, env: dict, timeout: float) -> tuple[float, float]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    live = ready = None
+    try:
+        while time.perf_counter() - started < timeout and ready is None:
+            if live is None and _ok(f"{base}/health/live"):
+                live = time.perf_counter() - started
+            if live is not None and _ok(f"{base}/health/ready"):
+                ready = time.perf_counter() - started
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+    if ready is None:
+        raise RuntimeError(f"worker not ready within {timeout}s")
+    return live, ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-live and time-to-ready of a fresh worker.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-startup-benchmark"),
+            "CALL_ARCHIVE_PATH": os.path.join(tmp, "startup.db"),
+        }
+        results = [run_once(args.port, env, args.timeout) for _ in range(args.runs)]
+
+    live = [r[0] for r in results]
+    ready = [r[1] for r in results]
+    print(f"live:  median {statistics.median(live) * 1000:.0f} ms  (min {min(live) * 1000:.0f})")
+    print(f"ready: median {statistics.median(ready) * 1000:.0f} ms  (min {min(ready) * 1000:.0f})")
+
+
+if __name__ == "__main__":
+    main()
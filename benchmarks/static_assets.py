@@ -0,0 +1,158 @@
+# benchmarks/static_assets.py — Cold agent login: bytes transferred and requests/sec per static mode
+#
+#   python -m benchmarks.static_assets                      # in-process, plain vs precompressed
+#   python -m benchmarks.static_assets --url http://localhost:8000   # a running worker, as configured
+#
+# A "cold login" is GET / plus every /assets/ file index.html references, with a
+# browser-like Accept-Encoding. A "reload" repeats it with the ETags from the
+# first visit. Uses frontend/dist if it has been built, otherwise a synthetic
+# Vite-shaped bundle of realistic size.
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import shutil
+import string
+import tempfile
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+from tools.static_assets import PrecompressedStaticFiles
+
+BROWSER_HEADERS = {"accept-encoding": "gzip, deflate, br, zstd"}
+ASSET_REF = re.compile(r'(?:src|href)="(/assets/[^"]+)"')
+
+
+def synthetic_dist(directory: str) -> str:
+    """A stand-in for `vite build` output: one ~600 KB JS chunk, one CSS file."""
+    rng = random.Random(7)
+    words = ["".join(rng.choices(string.ascii_letters, k=rng.randint(3, 12))) for _ in range(3000)]
+    js = "".join(
+        f"function {rng.choice(words)}({rng.choice(words)},{rng.choice(words)})"
+        f"{{return {rng.choice(words)}.{rng.choice(words)}({rng.randint(0, 9999)})}};"
+        for _ in range(9000)
+    )
+    css = "".join(f".{rng.choice(words)}{{margin:{rng.randint(0, 40)}px;color:#{rng.randint(0, 0xffffff):06x}}}" for _ in range(900))
+    assets = os.path.join(directory, "assets")
+    os.makedirs(assets)
+    with open(os.path.join(assets, "index-Dk3fW9aQ.js"), "w") as f:
+        f.write(js)
+    with open(os.path.join(assets, "index-Bq7xYt2L.css"), "w") as f:
+        f.write(css)
+    with open(os.path.join(directory, "index.html"), "w") as f:
+        f.write(
+            '<!doctype html><html><head><meta charset="UTF-8"><title>FNOL Dashboard</title>'
+            '<script type="module" crossorigin src="/assets/index-Dk3fW9aQ.js"></script>'
+            '<link rel="stylesheet" crossorigin href="/assets/index-Bq7xYt2L.css"></head>'
+            '<body><div id="root"></div></body></html>'
+        )
+    return directory
+
+
+def plain_app(dist: str) -> Starlette:
+    async def index(request):
+        return FileResponse(os.path.join(dist, "index.html"))
+
+    return Starlette(routes=[
+        Route("/", index),
+        Mount("/assets", StaticFiles(directory=os.path.join(dist, "assets"))),
+    ])
+
+
+def precompressed_app(dist: str) -> Starlette:
+    files = PrecompressedStaticFiles(dist)
+    files.load()
+
+    async def index(request: Request):
+        return files.response(request, "index.html")
+
+    async def asset(request: Request):
+        return files.response(request, f"assets/{request.path_params['path']}")
+
+    return Starlette(routes=[Route("/", index), Route("/assets/{path:path}", asset)])
+
+
+async def fetch(client: httpx.AsyncClient, path: str, etags: dict | None = None) -> tuple[int, int, str | None]:
+    headers = dict(BROWSER_HEADERS)
+    if etags and path in etags:
+        headers["if-none-match"] = etags[path]
+    async with client.stream("GET", path, headers=headers) as response:
+        wire = 0
+        async for chunk in response.aiter_raw():
+            wire += len(chunk)
+        return response.status_code, wire, response.headers.get("etag")
+
+
+async def login(client: httpx.AsyncClient, assets: list[str], etags: dict | None = None) -> tuple[int, int, dict]:
+    """One page load. Returns (requests, wire bytes, etags seen)."""
+    paths = ["/", *assets]
+    results = await asyncio.gather(*(fetch(client, p, etags) for p in paths))
+    return len(paths), sum(size for _, size, _ in results), {p: tag for p, (_, _, tag) in zip(paths, results)}
+
+
+async def measure(client: httpx.AsyncClient, seconds: float, concurrency: int) -> dict:
+    assets = ASSET_REF.findall((await client.get("/")).text)
+    requests, cold_bytes, etags = await login(client, assets)
+    _, reload_bytes, _ = await login(client, assets, etags)
+
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            n, _, _ = await login(client, assets)
+            done += n
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "cold_kb": cold_bytes / 1024,
+        "reload_kb": reload_bytes / 1024,
+        "rps": done / elapsed,
+    }
+
+
+def _print(name: str, r: dict):
+    print(f"{name:<14} {r['requests']:>4} req  cold {r['cold_kb']:>8.1f} KB  reload {r['reload_kb']:>7.1f} KB  {r['rps']:>8.0f} req/s")
+
+
+async def main(args):
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            _print(args.url, await measure(client, args.seconds, args.concurrency))
+        return
+
+    # Work on a copy so precompression doesn't touch the real build output
+    tmp = tempfile.mkdtemp()
+    if os.path.isdir(args.dist):
+        dist = shutil.copytree(args.dist, os.path.join(tmp, "dist"))
+    else:
+        dist = synthetic_dist(os.path.join(tmp, "dist"))
+        print(f"{args.dist} not built — using a synthetic bundle")
+    try:
+        for name, app in (("plain", plain_app(dist)), ("precompressed", precompressed_app(dist))):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                _print(name, await measure(client, args.seconds, args.concurrency))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Static asset serving benchmark (cold agent login).")
+    parser.add_argument("--url", help="benchmark a running server instead of in-process apps")
+    parser.add_argument("--dist", default=os.path.join("frontend", "dist"))
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous logins")
+    asyncio.run(main(parser.parse_args()))
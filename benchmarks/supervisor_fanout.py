@@ -0,0 +1,106 @@
+# benchmarks/supervisor_fanout.py — Cost of fanning live call events out to supervisors
+#
+#   python -m benchmarks.supervisor_fanout --calls 500 --supervisors 20
+#
+# Every call publishes intent / compliance / suggestion events per utterance;
+# supervisors drain their buffers concurrently, some of them slowly. Compares the
+# hub (one shared frame per event) with encoding a frame per subscriber, and
+# reports how far slow consumers fell behind.
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from tools.pubsub import EventHub
+
+INTENTS = ["car_accident", "car_theft", "car_vandalism", "life_death_claim", "general_inquiry"]
+SEVERITIES = ["medium", "high", "critical"]
+
+
+def _events(rng: random.Random, calls: int, utterances: int):
+    alerts = [{"ruleId": f"COMP-{i:03d}", "title": f"Rule {i}", "severity": rng.choice(SEVERITIES)} for i in range(12)]
+    suggestion = "Hi, I'm so sorry to hear about the accident. " * 4
+    for u in range(utterances):
+        for call in range(calls):
+            intent = INTENTS[call % len(INTENTS)]
+            yield f"call-{call}", "intent", {"intent": intent, "claim_type": intent.split("_")[0]}, intent, None
+            active = alerts[: 1 + (u + call) % len(alerts)]
+            yield f"call-{call}", "compliance", active, intent, active[-1]["severity"]
+            yield f"call-{call}", "suggestion", {"text": suggestion}, intent, None
+
+
+def per_subscriber_encoding(args, events) -> float:
+    """Baseline: each supervisor socket serializes its own copy of every event."""
+    started = time.perf_counter()
+    for call_id, type, data, intent, _ in events:
+        for _ in range(args.supervisors):
+            json.dumps({"type": type, "call_id": call_id, "intent": intent, "data": data})
+    return time.perf_counter() - started
+
+
+async def hub_fanout(args, events) -> tuple[float, EventHub, list]:
+    hub = EventHub()
+    rng = random.Random(args.seed)
+    subs = []
+    for i in range(args.supervisors):
+        filters = {}
+        if i % 4 == 1:
+            filters["intents"] = set(rng.sample(INTENTS, 2))
+        if i % 4 == 2:
+            filters["min_severity"] = "high"
+        subs.append(hub.subscribe(**filters))
+    received = [0] * len(subs)
+
+    async def consume(i, sub, delay):
+        while True:
+            await sub.next_frame()
+            received[i] += 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    # A quarter of the supervisors are slow (e.g. a browser tab on a bad network)
+    consumers = [
+        asyncio.create_task(consume(i, sub, 0.002 if i % 4 == 3 else 0))
+        for i, sub in enumerate(subs)
+    ]
+
+    started = time.perf_counter()
+    for n, (call_id, type, data, intent, severity) in enumerate(events):
+        hub.publish(call_id, type, data, intent=intent, severity=severity)
+        if n % 50 == 0:
+            await asyncio.sleep(0)  # let consumers run, as the real loop would between utterances
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.05)
+    for task in consumers:
+        task.cancel()
+    return elapsed, hub, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Supervisor pub/sub fan-out benchmark.")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--supervisors", type=int, default=20)
+    parser.add_argument("--utterances", type=int, default=10, help="events rounds per call")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    events = list(_events(random.Random(args.seed), args.calls, args.utterances))
+    print(f"{len(events):,} events from {args.calls} calls → {args.supervisors} supervisors")
+
+    baseline = per_subscriber_encoding(args, events)
+    print(f"per-subscriber encoding   {baseline * 1000:>8.0f} ms  ({baseline / len(events) * 1e6:.1f} µs/event)")
+
+    elapsed, hub, received = asyncio.run(hub_fanout(args, events))
+    stats = hub.snapshot()
+    print(f"hub publish + fan-out     {elapsed * 1000:>8.0f} ms  ({elapsed / len(events) * 1e6:.1f} µs/event)")
+    print(
+        f"frames delivered {sum(received):,}  coalesced {stats['coalesced']:,}  dropped {stats['dropped']:,}  "
+        f"slowest supervisor got {min(received):,}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# data/archive.py — Append-only call archive (SQLite in WAL mode, batched async writer)
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger("call-intelligence")
+
+ARCHIVE_PATH = os.getenv("CALL_ARCHIVE_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "call_archive.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    call_id          TEXT PRIMARY KEY,
+    started_at       REAL NOT NULL,
+    ended_at         REAL NOT NULL,
+    call_date        TEXT NOT NULL,
+    duration_seconds INTEGER NOT NULL,
+    policy_id        TEXT,
+    member_name      TEXT,
+    intent           TEXT,
+    overall_score    INTEGER,
+    utterances       INTEGER NOT NULL,
+    transcript       TEXT NOT NULL,
+    evaluation       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_calls_policy ON calls (policy_id, call_date);
+CREATE INDEX IF NOT EXISTS idx_calls_intent ON calls (intent, call_date);
+CREATE INDEX IF NOT EXISTS idx_calls_date   ON calls (call_date);
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO calls (
+    call_id, started_at, ended_at, call_date, duration_seconds, policy_id,
+    member_name, intent, overall_score, utterances, transcript, evaluation
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SUMMARY_COLUMNS = (
+    "call_id, started_at, ended_at, call_date, duration_seconds, policy_id, "
+    "member_name, intent, overall_score, utterances, evaluation"
+)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _to_row(record: dict) -> tuple:
+    """Flatten a call record into an INSERT row (runs on the writer thread)."""
+    member = record.get("member") or {}
+    evaluation = record.get("evaluation")
+    transcript = record.get("transcript") or []
+    started_at = record["started_at"]
+    ended_at = record.get("ended_at") or time.time()
+    return (
+        record["call_id"],
+        started_at,
+        ended_at,
+        datetime.fromtimestamp(started_at, tz=timezone.utc).strftime("%Y-%m-%d"),
+        int(ended_at - started_at),
+        member.get("policyId"),
+        member.get("name"),
+        record.get("intent"),
+        evaluation.get("overall_score") if evaluation else None,
+        len(transcript),
+        json.dumps(transcript, ensure_ascii=False),
+        json.dumps(evaluation, ensure_ascii=False) if evaluation else None,
+    )
+
+
+def _from_row(row: sqlite3.Row) -> dict:
+    item = dict(row)
+    for key in ("transcript", "evaluation"):
+        if item.get(key):
+            item[key] = json.loads(item[key])
+    return item
+
+
+class CallArchive:
+    """
+    Persists finished calls without blocking the event loop.
+
+    submit() only enqueues; a single writer task drains the queue in batches
+    and commits each batch in one transaction on a worker thread. Reads open
+    their own connection, which WAL mode lets run alongside the writer.
+    """
+
+    def __init__(
+        self,
+        path: str = ARCHIVE_PATH,
+        batch_size: int = 200,
+        flush_interval: float = 0.25,
+        max_queue: int = 10_000,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._writer: asyncio.Task | None = None
+        self._conn: sqlite3.Connection | None = None
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self):
+        self._conn = await asyncio.to_thread(self._open)
+        self._writer = asyncio.create_task(self._run(), name="call-archive-writer")
+        logger.info(f"🗄️ Call archive ready at {self.path}")
+
+    def _open(self) -> sqlite3.Connection:
+        conn = _connect(self.path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def submit(self, record: dict) -> bool:
+        """Queue a finished call for persistence. Never blocks; drops when the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"🗄️ Archive queue full — dropped call {record.get('call_id')}")
+            return False
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent calls a moment to join the same transaction
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await asyncio.to_thread(self._write, batch)
+                self.written += len(batch)
+            except Exception as e:
+                logger.error(f"❌ Archive write failed for {len(batch)} calls: {e}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: list[dict]):
+        rows = [_to_row(record) for record in batch]
+        with self._conn:
+            self._conn.executemany(_INSERT, rows)
+
+    async def close(self):
+        """Flush everything queued so far, then stop the writer."""
+        if self._writer:
+            await self._queue.join()
+            self._writer.cancel()
+            self._writer = None
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    # ─── Queries ─── #
+
+    async def query(
+        self,
+        policy_id: str | None = None,
+        intent: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Past calls (with evaluations, without transcripts), newest first."""
+        clauses, params = [], []
+        if policy_id:
+            clauses.append("policy_id = ?")
+            params.append(policy_id.upper())
+        if intent:
+            clauses.append("intent = ?")
+            params.append(intent)
+        if date_from:
+            clauses.append("call_date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("call_date <= ?")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {_SUMMARY_COLUMNS} FROM calls {where} ORDER BY started_at DESC LIMIT ? OFFSET ?"
+        return await asyncio.to_thread(self._read, sql, (*params, limit, offset))
+
+    async def get(self, call_id: str) -> dict | None:
+        rows = await asyncio.to_thread(self._read, "SELECT * FROM calls WHERE call_id = ?", (call_id,))
+        return rows[0] if rows else None
+
+    def _read(self, sql: str, params: tuple) -> list[dict]:
+        conn = _connect(self.path)
+        try:
+            return [_from_row(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
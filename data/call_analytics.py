@@ -0,0 +1,146 @@
+# data/call_analytics.py — Streaming per-call conversation analytics (timing + FNOL checklist)
+
+import re
+from functools import cache
+
+from data.compliance import _alternation, _category_matches
+from data.knowledge import fnol_checklists
+
+TICKS_PER_SECOND = 10_000_000  # Azure Speech offsets/durations are 100-ns ticks
+SECONDS_PER_WORD = 0.4         # ~150 wpm, used when the client sends no duration
+LONG_SILENCE_S = 5.0
+
+
+class _CompiledChecklist:
+    """Every checklist phrase behind one regex, built once per process."""
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self.phrase_items: dict[str, list[str]] = {}
+        for item in items:
+            for phrase in item["phrases"]:
+                self.phrase_items.setdefault(phrase, []).append(item["itemId"])
+        # Word boundary at the start only, so stems like "injur" match "injured"/"injuries"
+        self.scanner = re.compile(f"(?=\\b({_alternation(self.phrase_items)}))")
+        self.implied = {p: frozenset(o for o in self.phrase_items if o in p) for p in self.phrase_items}
+
+    def items_in(self, text_lower: str) -> set[str]:
+        found = set()
+        for match in self.scanner.finditer(text_lower):
+            for phrase in self.implied[match.group(1)]:
+                found.update(self.phrase_items[phrase])
+        return found
+
+
+@cache
+def _compiled() -> _CompiledChecklist:
+    return _CompiledChecklist(fnol_checklists())
+
+
+def claim_category(intent_or_claim_type: str | None) -> str:
+    """'car_accident' / 'car_insurance' → 'car_insurance', and so on."""
+    value = (intent_or_claim_type or "").lower()
+    if value.startswith("car"):
+        return "car_insurance"
+    if value.startswith("life"):
+        return "life_insurance"
+    return "general"
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CallAnalytics:
+    """
+    Conversation facts for one call, fed one finalized utterance at a time.
+
+    Each utterance is placed on the call timeline from its Azure offset and
+    duration (estimated from word count when the client doesn't send one), so
+    talk time per speaker, silence between turns, overlapping speech and how
+    long the agent took to answer the customer all accumulate in O(1) per
+    line. The text is scanned once for FNOL checklist items; coverage is only
+    judged at summary() time, once the claim type is known.
+    """
+
+    def __init__(self):
+        self._compiled = _compiled()
+        self.talk_time: dict[str, float] = {}
+        self.utterances: dict[str, int] = {}
+        self.silence = 0.0
+        self.long_silences = 0
+        self.overlap = 0.0
+        self.response_latencies: list[float] = []
+        self.interruptions = 0
+        self.estimated_durations = 0
+        self._covered: set[str] = set()
+        self._end = 0.0
+        self._last_speaker: str | None = None
+
+    @classmethod
+    def from_lines(cls, lines: list[dict]) -> "CallAnalytics":
+        """Replay a stored transcript (e.g. from the call archive)."""
+        analytics = cls()
+        for line in lines:
+            analytics.add(line["speaker"], line["text"], line.get("offset"), line.get("duration"))
+        return analytics
+
+    def add(self, speaker: str, text: str, offset: int | None, duration: int | None = None) -> None:
+        if duration:
+            length = duration / TICKS_PER_SECOND
+        else:
+            length = len(text.split()) * SECONDS_PER_WORD
+            self.estimated_durations += 1
+        # No offset (typed input, demo scripts) → assume the line follows the previous one
+        start = offset / TICKS_PER_SECOND if offset else self._end
+        end = start + length
+
+        if self._last_speaker is not None:
+            gap = start - self._end
+            if gap >= 0:
+                self.silence += gap
+                self.long_silences += gap >= LONG_SILENCE_S
+            else:
+                self.overlap += min(self._end, end) - start
+            if self._last_speaker == "Customer" and speaker == "Agent":
+                self.response_latencies.append(max(gap, 0.0))
+                self.interruptions += gap < 0
+
+        self.talk_time[speaker] = self.talk_time.get(speaker, 0.0) + length
+        self.utterances[speaker] = self.utterances.get(speaker, 0) + 1
+        self._end = max(self._end, end)
+        self._last_speaker = speaker
+        self._covered |= self._compiled.items_in(text.lower())
+
+    def checklist(self, claim_type: str | None) -> dict:
+        category = claim_category(claim_type)
+        items = [i for i in self._compiled.items if _category_matches(i["category"], category)]
+        covered = [i["label"] for i in items if i["itemId"] in self._covered]
+        missing = [i["label"] for i in items if i["itemId"] not in self._covered]
+        return {
+            "covered": covered,
+            "missing": missing,
+            "coverage": round(len(covered) / len(items), 2) if items else 1.0,
+        }
+
+    def summary(self, claim_type: str | None) -> dict:
+        total_talk = sum(self.talk_time.values())
+        latencies = self.response_latencies
+        return {
+            "talk_time_seconds": {s: round(t, 1) for s, t in self.talk_time.items()},
+            "agent_talk_ratio": round(self.talk_time.get("Agent", 0.0) / total_talk, 2) if total_talk else None,
+            "utterances": dict(self.utterances),
+            "silence_seconds": round(self.silence, 1),
+            "long_silences": self.long_silences,
+            "overlap_seconds": round(self.overlap, 1),
+            "agent_response_latency_seconds": {
+                "mean": round(sum(latencies) / len(latencies), 2),
+                "p90": round(_quantile(latencies, 0.9), 2),
+                "max": round(max(latencies), 2),
+                "turns": len(latencies),
+            } if latencies else None,
+            "agent_interruptions": self.interruptions,
+            "timing_estimated": self.estimated_durations > 0,
+            "checklist": self.checklist(claim_type),
+        }
@@ -0,0 +1,133 @@
+# data/compliance.py — Per-call rolling compliance tracking (incremental, precompiled matchers)
+
+import re
+from functools import cache
+
+from data.knowledge import compliance_rules
+
+
+def _alternation(terms) -> str:
+    # Longest first so "hit and run" wins over "hit" at the same position
+    return "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+
+
+def _category_matches(rule_category: str, intent_category: str) -> bool:
+    """Same gate as get_compliance_alerts: general rules always, others only for the active line."""
+    if rule_category == "general":
+        return True
+    # No claim type yet → general rules only ("" is a substring of every category)
+    return bool(intent_category) and (rule_category in intent_category or intent_category in rule_category)
+
+
+class _CompiledRules:
+    """All trigger terms of all rules behind one regex, built once per process."""
+
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        terms = {t for rule in rules for t in (*rule["triggers"], *rule.get("triggersAll", ())) if t != "_always"}
+        # A lookahead at every position finds overlapping terms in one pass
+        self.scanner = re.compile(f"(?=({_alternation(terms)}))")
+        # Only the longest term is captured at a position; shorter terms it contains also occurred
+        self.implied = {t: frozenset(o for o in terms if o in t) for t in terms}
+        self.satisfiers = {
+            rule["ruleId"]: (
+                rule["satisfiedBy"].get("speaker"),
+                re.compile(_alternation(rule["satisfiedBy"]["phrases"])),
+            )
+            for rule in rules if rule.get("satisfiedBy")
+        }
+
+    def terms_in(self, text_lower: str) -> set[str]:
+        found = set()
+        for match in self.scanner.finditer(text_lower):
+            found |= self.implied[match.group(1)]
+        return found
+
+
+@cache
+def _compiled() -> _CompiledRules:
+    return _CompiledRules(compliance_rules())
+
+
+class ComplianceTracker:
+    """
+    Compliance state for one call, fed one finalized utterance at a time.
+
+    Each utterance is scanned once; trigger terms accumulate across the call, so
+    a rule can fire from words said several lines earlier (or once the intent
+    settles on its category), and rules with "triggersAll" fire only after every
+    listed term has come up. Rules with "satisfiedBy" resolve when the given
+    speaker says one of the phrases (e.g. the agent giving the recording notice)
+    and are never raised again. When the claim type switches to another
+    specific line, fired rules of the old category are retired (reported
+    alongside resolved ones) and may fire again if the call comes back to it. update() reports only what changed.
+    """
+
+    def __init__(self):
+        self._compiled = _compiled()
+        self._seen_terms: set[str] = set()
+        self._fired: dict[str, dict] = {}
+        self._satisfied: set[str] = set()
+
+    @classmethod
+    def from_lines(cls, lines: list[dict], claim_type: str | None) -> "ComplianceTracker":
+        """Replay a stored transcript against one claim type (e.g. for post-call evaluation)."""
+        tracker = cls()
+        for line in lines:
+            tracker.update(line["text"], line["speaker"], claim_type)
+        return tracker
+
+    def update(self, transcript: str, speaker: str | None, intent: str | None) -> tuple[list[dict], list[str]]:
+        """Returns (newly fired rules, ruleIds resolved or retired by this utterance)."""
+        text_lower = transcript.lower()
+        intent_category = intent.lower() if intent else ""
+        self._seen_terms |= self._compiled.terms_in(text_lower)
+
+        resolved = []
+        for rule_id, (required_speaker, phrases) in self._compiled.satisfiers.items():
+            if rule_id in self._satisfied or (required_speaker and speaker != required_speaker):
+                continue
+            if phrases.search(text_lower):
+                self._satisfied.add(rule_id)
+                if self._fired.pop(rule_id, None) is not None:
+                    resolved.append(rule_id)
+
+        # Category-scoped alerts stand until the call switches to another specific
+        # line (car ↔ life); a general or unknown category never retires them
+        if intent_category and "general" not in intent_category:
+            for rule_id, rule in list(self._fired.items()):
+                if not _category_matches(rule.get("category", ""), intent_category):
+                    del self._fired[rule_id]
+                    resolved.append(rule_id)
+
+        fired = []
+        for rule in self._compiled.rules:
+            rule_id = rule["ruleId"]
+            if rule_id in self._fired or rule_id in self._satisfied:
+                continue
+            if not _category_matches(rule.get("category", ""), intent_category):
+                continue
+            if self._triggered(rule, intent_category):
+                self._fired[rule_id] = rule
+                fired.append(rule)
+
+        return fired, resolved
+
+    def _triggered(self, rule: dict, intent_category: str) -> bool:
+        required = rule.get("triggersAll")
+        if required and not all(t in self._seen_terms for t in required):
+            return False
+        triggers = rule["triggers"]
+        if not triggers and required:
+            return True
+        return "_always" in triggers or any(t in self._seen_terms or t in intent_category for t in triggers)
+
+    @property
+    def active_alerts(self) -> list[dict]:
+        """Fired and not yet resolved, in firing order."""
+        return list(self._fired.values())
+
+    @property
+    def unmet_obligations(self) -> list[dict]:
+        """Active alerts of rules with a "satisfiedBy" contract: things the agent had to say and never did."""
+        return [rule for rule_id, rule in self._fired.items() if rule_id in self._compiled.satisfiers]
@@ -2,15 +2,37 @@
 
 import json
 import os
+from functools import cache
 
 _DATA_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# ─── Load JSON files once at import time ─── #
-with open(os.path.join(_DATA_DIR, "knowledge_base.json"), "r", encoding="utf-8") as f:
-    KNOWLEDGE_BASE: list[dict] = json.load(f)
 
-with open(os.path.join(_DATA_DIR, "compliance_rules.json"), "r", encoding="utf-8") as f:
-    COMPLIANCE_RULES: list[dict] = json.load(f)
+# ─── Load JSON files once, on first use ─── #
+@cache
+def _load(filename: str) -> list[dict]:
+    with open(os.path.join(_DATA_DIR, filename), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def knowledge_base() -> list[dict]:
+    return _load("knowledge_base.json")
+
+
+def compliance_rules() -> list[dict]:
+    return _load("compliance_rules.json")
+
+
+def fnol_checklists() -> list[dict]:
+    return _load("fnol_checklists.json")
+
+
+def __getattr__(name: str):
+    # Keep KNOWLEDGE_BASE / COMPLIANCE_RULES importable without loading them at import time
+    if name == "KNOWLEDGE_BASE":
+        return knowledge_base()
+    if name == "COMPLIANCE_RULES":
+        return compliance_rules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def search_knowledge(query: str, top_k: int = 3) -> list[dict]:
@@ -22,7 +44,7 @@ def search_knowledge(query: str, top_k: int = 3) -> list[dict]:
     query_lower = query.lower()
     scored: list[tuple[int, dict]] = []
 
-    for doc in KNOWLEDGE_BASE:
+    for doc in knowledge_base():
         score = sum(1 for tag in doc["tags"] if tag in query_lower)
         if score > 0:
             scored.append((score, doc))
@@ -41,10 +63,12 @@ def get_compliance_alerts(intent: str, transcript: str) -> list[dict]:
     intent_category = intent.lower() if intent else ""
     matched: list[dict] = []
 
-    for rule in COMPLIANCE_RULES:
+    for rule in compliance_rules():
         rule_category = rule.get("category", "")
         # Enforce strict category checks. Only process if 'general' or matches the active intent type.
-        if rule_category != "general" and not (rule_category in intent_category or intent_category in rule_category):
+        if rule_category != "general" and not (
+            intent_category and (rule_category in intent_category or intent_category in rule_category)
+        ):
             continue
 
         # Always-on rules
@@ -0,0 +1,87 @@
+# data/member_views.py — Precomputed member profile views + per-connection delta sync
+
+import hashlib
+import json
+
+
+class MemberView:
+    """
+    A member profile prepared for the frontend once: content version plus the
+    fully serialized `member_profile` frame, so repeated sends cost no encoding.
+    """
+
+    __slots__ = ("policy_id", "version", "source", "data", "frame")
+
+    def __init__(self, member: dict):
+        encoded = json.dumps(member, sort_keys=True, ensure_ascii=False)
+        self.policy_id: str = member["policyId"]
+        self.version: str = hashlib.sha1(encoded.encode()).hexdigest()[:12]
+        self.source = member
+        self.data = dict(member)  # snapshot of top-level fields, the base for later deltas
+        self.frame = json.dumps({"type": "member_profile", "data": member}, ensure_ascii=False)
+
+
+_VIEWS: dict[str, MemberView] = {}
+
+
+def get_member_view(member: dict) -> MemberView:
+    """
+    Cached view for a member record. A record returned as a new object (e.g. the
+    CRM reloaded it) gets a fresh view; in-place edits need invalidate_member_view().
+    """
+    view = _VIEWS.get(member["policyId"])
+    if view is None or view.source is not member:
+        view = MemberView(member)
+        _VIEWS[view.policy_id] = view
+    return view
+
+
+def invalidate_member_view(policy_id: str) -> None:
+    _VIEWS.pop(policy_id, None)
+
+
+class MemberProfileSync:
+    """
+    Tracks which profile versions one WebSocket client already holds and decides
+    the smallest frame that brings it up to date:
+
+        nothing                → the same profile is already on screen
+        member_profile_ref     → client has this exact version cached, just switch to it
+        member_profile_delta   → client has an older version, send changed fields only
+        member_profile         → first time this client sees the member
+    """
+
+    def __init__(self):
+        self._sent: dict[str, MemberView] = {}
+        self.current: str | None = None
+
+    def frame_for(self, member: dict) -> str | None:
+        view = get_member_view(member)
+        previous = self._sent.get(view.policy_id)
+        is_current = self.current == view.policy_id
+        self._sent[view.policy_id] = view
+        self.current = view.policy_id
+
+        if previous is None:
+            return view.frame
+        if previous.version == view.version:
+            if is_current:
+                return None
+            return json.dumps({
+                "type": "member_profile_ref",
+                "data": {"policyId": view.policy_id, "version": view.version},
+            })
+        return json.dumps({
+            "type": "member_profile_delta",
+            "data": {
+                "policyId": view.policy_id,
+                "version": view.version,
+                "baseVersion": previous.version,
+                "changes": {k: v for k, v in view.data.items() if previous.data.get(k) != v},
+                "removed": [k for k in previous.data if k not in view.data],
+            },
+        }, ensure_ascii=False)
+
+    def reset(self) -> None:
+        """A new call starts with an empty card; the client's cache is kept."""
+        self.current = None
@@ -152,10 +152,17 @@ MEMBER_DB = {
 
 import re
 
+from data.name_index import NAME_MATCH_MARGIN, NAME_MATCH_THRESHOLD, member_name_index, tokenize
+
 def get_member(policy_id: str = None, name: str = None, phone: str = None):
     """
     Look up a policyholder by their policy ID, Name, or Phone Number.
-    Performs case-insensitive matching on names and strips formatting on phones.
+    Names are resolved through the member name index: first literally (every
+    word said appears in exactly one member's name), then fuzzily for ASR
+    mishearings ("Rajish Kumar"), where only a full name whose best candidate
+    is above threshold and clearly ahead of the runner-up resolves. Anything
+    ambiguous is left to find_members_by_name() for the agent to confirm.
+    Phones are matched with formatting stripped.
     """
     # 1. Direct ID match
     if policy_id:
@@ -167,16 +174,30 @@ def get_member(policy_id: str = None, name: str = None, phone: str = None):
     search_name = name.lower().strip() if name else None
     search_phone = re.sub(r'\D', '', phone) if phone else None
 
-    # 2. Iterate through all members to find a fuzzy match for name or phone
-    for pid, data in MEMBER_DB.items():
-        # Check Name
-        if search_name and search_name in data["name"].lower():
-            return data
-            
-        # Check Phone
-        if search_phone:
+    # 2. Literal name match from the index's token postings
+    if search_name:
+        exact = member_name_index().exact(search_name, limit=2)
+        if len(exact) == 1:
+            return MEMBER_DB[exact[0]]
+
+    # 3. Phone match
+    if search_phone:
+        for pid, data in MEMBER_DB.items():
             db_phone = re.sub(r'\D', '', data.get("phone", ""))
             if search_phone in db_phone:
                 return data
 
+    # 4. Fuzzy / phonetic name match
+    if search_name and len(tokenize(search_name)) >= 2:
+        candidates = find_members_by_name(search_name, limit=2)
+        if candidates and candidates[0]["score"] >= NAME_MATCH_THRESHOLD and (
+            len(candidates) == 1 or candidates[0]["score"] - candidates[1]["score"] >= NAME_MATCH_MARGIN
+        ):
+            return MEMBER_DB[candidates[0]["policyId"]]
+
     return None
+
+
+def find_members_by_name(name: str, limit: int = 5) -> list[dict]:
+    """Ranked [{"policyId", "name", "score"}] for a possibly misheard name."""
+    return member_name_index().search(name, limit=limit)
@@ -0,0 +1,277 @@
+# data/name_index.py — Fuzzy + phonetic name index for ASR-misheard caller names
+
+import re
+from array import array
+from functools import cache
+from itertools import product
+
+# A misheard token may be up to this many edits away (shorter tokens get fewer)
+MAX_EDIT_DISTANCE = 2
+SHORT_TOKEN_LEN = 5
+# Floor for a token that sounds the same even if it is spelled further apart
+PHONETIC_SIMILARITY = 0.8
+# get_member() only auto-picks a name match at or above this score, and only if
+# it beats the runner-up by this much
+NAME_MATCH_THRESHOLD = 0.75
+NAME_MATCH_MARGIN = 0.1
+
+_NON_ALPHA = re.compile(r"[^a-z\s]")
+_PHONETIC_REWRITES = (
+    ("x", "ks"), ("sch", "s"), ("sh", "s"), ("ch", "C"), ("ph", "f"), ("ck", "k"),
+    ("q", "k"), ("c", "k"), ("z", "j"), ("w", "v"), ("th", "t"), ("dh", "d"),
+    ("bh", "b"), ("kh", "k"), ("gh", "g"), ("jh", "j"),
+)
+
+
+def tokenize(name: str) -> list[str]:
+    return _NON_ALPHA.sub("", name.lower()).split()
+
+
+def phonetic_key(token: str) -> str:
+    """
+    Consonant skeleton after folding spellings that sound alike
+    (sh/s, w/v, ph/f, z/j, aspirated kh/bh/dh…), so "Rajish", "Rajesh" and
+    "Raajesh" all become "rjs".
+    """
+    for src, dst in _PHONETIC_REWRITES:
+        token = token.replace(src, dst)
+    if not token:
+        return ""
+    head = "a" if token[0] in "aeiouy" else token[0]
+    key = [head]
+    for ch in token[1:]:
+        if ch in "aeiouyh" or ch == key[-1]:
+            continue
+        key.append(ch)
+    return "".join(key)
+
+
+def _max_distance(token: str) -> int:
+    return 1 if len(token) <= SHORT_TOKEN_LEN else MAX_EDIT_DISTANCE
+
+
+def _deletes(token: str, distance: int) -> set[str]:
+    """Every string reachable by removing up to `distance` characters (SymSpell)."""
+    out = frontier = {token}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        out = out | frontier
+    return out
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal-string-alignment Damerau–Levenshtein distance, giving up as soon
+    as it must exceed `limit` (returns limit + 1 then).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Names mostly differ in the middle; a shared prefix/suffix costs nothing
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    # Keep one character of context so a transposition across the cut is still seen
+    start = max(start - 1, 0)
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b) if len(a) + len(b) <= limit else limit + 1
+
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            value = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1] and prev2[j - 2] + 1 < value:
+                value = prev2[j - 2] + 1
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+class NameIndex:
+    """
+    Ranked fuzzy lookup of members by spoken name.
+
+    Built once over all member names. Each distinct name token gets an id;
+    tokens are reachable by a SymSpell deletion index (bounded edit distance
+    in a handful of dict lookups, independent of member count) and by a
+    phonetic key. Members are keyed by their (first, last) token pair, so a
+    two-token query costs one dict probe per candidate pair rather than a
+    scan. Single-token queries, and longer ones whose first and last tokens
+    don't form a known pair ("Mr Rajesh Kumar"), fall back to per-token
+    postings.
+    """
+
+    def __init__(self):
+        self._token_ids: dict[str, int] = {}
+        self._tokens: list[str] = []
+        self._deletes: dict[str, list[int]] = {}
+        self._phonetic: dict[str, list[int]] = {}
+        self._postings: list[array] = []
+        self._pairs: dict[int, int | list[int]] = {}
+        self._ids: list[str] = []
+        self._names: list[str] = []
+
+    @classmethod
+    def build(cls, members) -> "NameIndex":
+        """members: iterable of (policy_id, name)."""
+        index = cls()
+        for policy_id, name in members:
+            index.add(policy_id, name)
+        return index
+
+    def _token_id(self, token: str) -> int:
+        tid = self._token_ids.get(token)
+        if tid is None:
+            tid = self._token_ids[token] = len(self._tokens)
+            self._tokens.append(token)
+            self._postings.append(array("I"))
+            for d in _deletes(token, _max_distance(token)):
+                self._deletes.setdefault(d, []).append(tid)
+            self._phonetic.setdefault(phonetic_key(token), []).append(tid)
+        return tid
+
+    def _pair_key(self, a: int, b: int) -> int:
+        lo, hi = (a, b) if a <= b else (b, a)
+        return (lo << 32) | hi
+
+    def add(self, policy_id: str, name: str) -> None:
+        tokens = tokenize(name)
+        if not tokens:
+            return
+        member = len(self._ids)
+        self._ids.append(policy_id)
+        self._names.append(name)
+        tids = [self._token_id(t) for t in tokens]
+        for tid in set(tids):
+            self._postings[tid].append(member)
+        key = self._pair_key(tids[0], tids[-1])
+        existing = self._pairs.get(key)
+        if existing is None:
+            self._pairs[key] = member
+        elif isinstance(existing, int):
+            self._pairs[key] = [existing, member]
+        else:
+            existing.append(member)
+
+    def exact(self, name: str, limit: int = 2) -> list[str]:
+        """
+        Policy ids of members whose name contains every word of `name` (any
+        order, case-insensitive), via posting-list intersection.
+        """
+        tids = []
+        for token in set(tokenize(name)):
+            tid = self._token_ids.get(token)
+            if tid is None:
+                return []
+            tids.append(tid)
+        if not tids:
+            return []
+        tids.sort(key=lambda t: len(self._postings[t]))
+        members = set(self._postings[tids[0]])
+        for tid in tids[1:]:
+            members.intersection_update(self._postings[tid])
+            if not members:
+                return []
+        return [self._ids[m] for m in sorted(members)[:limit]]
+
+    def similar_tokens(self, token: str) -> dict[int, float]:
+        """Token id → similarity in (0, 1] for vocabulary tokens close to `token`."""
+        limit = _max_distance(token)
+        candidates: set[int] = set()
+        for d in _deletes(token, limit):
+            candidates.update(self._deletes.get(d, ()))
+        sounds_like = set(self._phonetic.get(phonetic_key(token), ()))
+
+        scores = {}
+        # Anything within `limit` edits shares a delete with the query, so only these need verifying
+        for tid in candidates:
+            other = self._tokens[tid]
+            dist = edit_distance(token, other, limit)
+            if dist <= limit:
+                scores[tid] = 1 - dist / max(len(token), len(other))
+        for tid in sounds_like:
+            if scores.get(tid, 0.0) < PHONETIC_SIMILARITY:
+                scores[tid] = PHONETIC_SIMILARITY
+        return scores
+
+    def search(self, name: str, limit: int = 5, min_score: float = 0.5) -> list[dict]:
+        """
+        Ranked candidates for a (possibly misheard) name:
+        [{"policyId", "name", "score"}] with score in (0, 1], best first.
+        """
+        tokens = tokenize(name)
+        if not tokens:
+            return []
+
+        scored: dict[int, float] = {}
+        if len(tokens) == 1:
+            # One token: every member holding a close token, slightly discounted (ambiguous)
+            for tid, score in self.similar_tokens(tokens[0]).items():
+                for member in self._postings[tid]:
+                    if score * 0.9 > scored.get(member, 0.0):
+                        scored[member] = score * 0.9
+        else:
+            first = self.similar_tokens(tokens[0])
+            last = self.similar_tokens(tokens[-1])
+            for (a, sa), (b, sb) in product(first.items(), last.items()):
+                hit = self._pairs.get(self._pair_key(a, b))
+                if hit is None:
+                    continue
+                score = (sa + sb) / 2
+                for member in (hit,) if isinstance(hit, int) else hit:
+                    if score > scored.get(member, 0.0):
+                        scored[member] = score
+            if not scored:
+                scored = self._score_tokens(tokens)
+
+        ranked = sorted(
+            ((score, member) for member, score in scored.items() if score >= min_score),
+            key=lambda x: (-x[0], x[1]),
+        )[:limit]
+        return [
+            {"policyId": self._ids[member], "name": self._names[member], "score": round(score, 3)}
+            for score, member in ranked
+        ]
+
+    def _score_tokens(self, tokens: list[str]) -> dict[int, float]:
+        """
+        Members holding any of the tokens, scored by the mean over query tokens
+        of their best similarity, so filler ("mr", "ji") and unmatched tokens
+        count against the match.
+        """
+        totals: dict[int, float] = {}
+        for token in tokens:
+            best: dict[int, float] = {}
+            for tid, score in self.similar_tokens(token).items():
+                for member in self._postings[tid]:
+                    if score > best.get(member, 0.0):
+                        best[member] = score
+            for member, score in best.items():
+                totals[member] = totals.get(member, 0.0) + score
+        return {member: total / len(tokens) for member, total in totals.items()}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+@cache
+def member_name_index() -> NameIndex:
+    from data.members import MEMBER_DB
+
+    return NameIndex.build((pid, data["name"]) for pid, data in MEMBER_DB.items())
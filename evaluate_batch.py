@@ -0,0 +1,245 @@
+# evaluate_batch.py — Offline batch re-evaluation of archived call transcripts
+#
+# Usage:
+#   python evaluate_batch.py call_archive.db --output evaluations.jsonl --concurrency 8
+#   python evaluate_batch.py exports/ more_calls.jsonl -o evaluations.jsonl
+#
+# Inputs may be the SQLite call archive, .jsonl files (one call per line), .json
+# files (one call or a list of calls) or directories of those. Each call needs a
+# "transcript" list of {speaker, text, timestamp} lines; "call_id", "intent",
+# "member"/"member_name" and "duration_seconds" are used when present.
+#
+# The output JSONL doubles as the checkpoint: every result carries its call_id and
+# a content hash of the transcript plus the current rubric, so re-running after an
+# interruption (or after an unrelated edit) skips calls that are already scored.
+# Calls with identical content are evaluated once; each still gets its own row.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("call-intelligence")
+
+
+# ─── Reading transcripts from disk ─── #
+
+def _read_archive(path: str):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute(
+            "SELECT call_id, duration_seconds, policy_id, member_name, intent, transcript "
+            "FROM calls ORDER BY started_at"
+        ):
+            yield {
+                "call_id": row["call_id"],
+                "duration_seconds": row["duration_seconds"],
+                "intent": row["intent"],
+                "member": {"policyId": row["policy_id"], "name": row["member_name"]} if row["member_name"] else None,
+                "transcript": json.loads(row["transcript"]),
+            }
+    finally:
+        conn.close()
+
+
+def _read_file(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            data = json.load(f)
+            yield from (data if isinstance(data, list) else [data])
+
+
+def iter_calls(paths: list[str]):
+    """Yield call records from every input path, in a stable order."""
+    for path in paths:
+        if os.path.isdir(path):
+            entries = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".json", ".jsonl", ".db"))
+            )
+            yield from iter_calls(entries)
+        elif path.endswith((".db", ".sqlite", ".sqlite3")):
+            yield from _read_archive(path)
+        else:
+            for i, call in enumerate(_read_file(path)):
+                call.setdefault("call_id", f"{os.path.basename(path)}:{i}")
+                yield call
+
+
+# ─── Content hashing ─── #
+
+def rubric_hash() -> str:
+    """Everything besides the call itself that shapes the prompt: model, rubric, facts template and data."""
+    from data.knowledge import compliance_rules, fnol_checklists
+    from tools.llm import EVALUATION_FACTS_VERSION, EVALUATION_SYSTEM_PROMPT, get_router
+
+    model = get_router().primary_model("evaluation")
+    # Checklists scope the FNOL coverage facts; satisfiedBy rules the unmet compliance obligations
+    data = json.dumps([fnol_checklists(), compliance_rules()], sort_keys=True)
+    payload = f"{model}\n{EVALUATION_SYSTEM_PROMPT}\nfacts v{EVALUATION_FACTS_VERSION}\n{data}"
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def content_hash(call: dict, rubric: str) -> str:
+    """Stable hash of everything that feeds the evaluation prompt."""
+    member = call.get("member") or {}
+    payload = {
+        "rubric": rubric,
+        # offset/duration feed the timing facts in the prompt (CallAnalytics)
+        "transcript": [
+            [l.get("speaker"), l.get("timestamp"), l.get("text"), l.get("offset"), l.get("duration")]
+            for l in call["transcript"]
+        ],
+        "duration": int(call.get("duration_seconds") or 0),
+        "intent": call.get("intent"),
+        "member": member.get("name") or call.get("member_name"),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def load_checkpoint(output: str) -> tuple[set[tuple[str, str]], dict[str, dict]]:
+    """
+    Returns ((call_id, content_hash) pairs already written,
+    content_hash → evaluation for reuse by calls with the same content).
+    """
+    done: set[tuple[str, str]] = set()
+    cached: dict[str, dict] = {}
+    if not os.path.exists(output):
+        return done, cached
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                done.add((row["call_id"], row["content_hash"]))
+                cached[row["content_hash"]] = row["evaluation"]
+            except (ValueError, KeyError):
+                continue  # torn last line from an interrupted run
+    return done, cached
+
+
+# ─── Batch evaluation ─── #
+
+async def run(paths: list[str], output: str, concurrency: int, limit: int | None) -> dict:
+    from tools.llm import estimate_cost, generate_post_call_evaluation, usage_totals
+
+    rubric = rubric_hash()
+    done, cached = load_checkpoint(output)
+    # content_hash → call_ids waiting on an evaluation already in flight
+    followers: dict[str, list[str]] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"evaluated": 0, "reused": 0, "skipped": 0, "failed": 0}
+
+    def write_row(sink, call_id: str, digest: str, evaluation: dict):
+        sink.write(json.dumps({
+            "call_id": call_id,
+            "content_hash": digest,
+            "rubric_hash": rubric,
+            "evaluated_at": time.time(),
+            "evaluation": evaluation,
+        }, ensure_ascii=False) + "\n")
+        sink.flush()
+
+    async def evaluate(call: dict, digest: str, sink):
+        try:
+            member = call.get("member") or ({"name": call["member_name"]} if call.get("member_name") else None)
+            evaluation = await generate_post_call_evaluation(
+                transcript_lines=call["transcript"],
+                call_duration=float(call.get("duration_seconds") or 0),
+                detected_intent=call.get("intent"),
+                member_data=member,
+            )
+        except Exception as e:
+            waiting = followers.pop(digest, [])
+            stats["failed"] += 1 + len(waiting)
+            logger.error(f"❌ {call['call_id']}: {e}")
+            return
+        finally:
+            semaphore.release()
+        write_row(sink, call["call_id"], digest, evaluation)
+        stats["evaluated"] += 1
+        cached[digest] = evaluation
+        for call_id in followers.pop(digest, []):
+            write_row(sink, call_id, digest, evaluation)
+            stats["reused"] += 1
+
+    started = time.perf_counter()
+    with open(output, "a", encoding="utf-8") as sink:
+        pending: set[asyncio.Task] = set()
+        queued = 0
+        for call in iter_calls(paths):
+            if limit and queued >= limit:
+                break
+            if not call.get("transcript"):
+                continue
+            digest = content_hash(call, rubric)
+            key = (call["call_id"], digest)
+            if key in done:
+                stats["skipped"] += 1
+                continue
+            done.add(key)
+            # Same content as a call already scored (or being scored): reuse, don't pay twice
+            if digest in cached:
+                write_row(sink, call["call_id"], digest, cached[digest])
+                stats["reused"] += 1
+                continue
+            if digest in followers:
+                followers[digest].append(call["call_id"])
+                continue
+            followers[digest] = []
+
+            # Acquire before spawning so a huge archive never becomes a huge task list
+            await semaphore.acquire()
+            task = asyncio.create_task(evaluate(call, digest, sink))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            queued += 1
+        await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - started
+
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["calls_per_minute"] = round(stats["evaluated"] / elapsed * 60, 1) if elapsed > 0 else 0.0
+    stats["prompt_tokens"] = sum(t["prompt_tokens"] for t in usage_totals.values())
+    stats["completion_tokens"] = sum(t["completion_tokens"] for t in usage_totals.values())
+    stats["estimated_cost_usd"] = round(estimate_cost(), 4)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score archived calls with the current post-call rubric.")
+    parser.add_argument("inputs", nargs="+", help="call archive (.db), .json/.jsonl files or directories")
+    parser.add_argument("-o", "--output", default="evaluations.jsonl", help="results JSONL (also the resume checkpoint)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="max evaluations in flight")
+    parser.add_argument("--limit", type=int, default=None, help="evaluate at most N new calls")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run(args.inputs, args.output, max(args.concurrency, 1), args.limit))
+
+    print(
+        f"Evaluated {stats['evaluated']} calls "
+        f"({stats['reused']} identical reused, {stats['skipped']} unchanged, {stats['failed']} failed) "
+        f"in {stats['elapsed_seconds']}s — {stats['calls_per_minute']} calls/min"
+    )
+    print(
+        f"Tokens: {stats['prompt_tokens']} in / {stats['completion_tokens']} out — "
+        f"estimated cost ${stats['estimated_cost_usd']:.4f}"
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
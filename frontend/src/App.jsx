@@ -8,10 +8,11 @@ import ComplianceCard from './components/ComplianceCard.jsx';
 import SuggestionCard from './components/SuggestionCard.jsx';
 import PostCallCard from './components/PostCallCard.jsx';
 
-// Determine WebSocket URL
-const WS_URL = import.meta.env.DEV
+// Determine WebSocket URL (?agent=<id> on the page tags this agent's calls for supervisors)
+const AGENT_ID = new URLSearchParams(window.location.search).get('agent');
+const WS_URL = (import.meta.env.DEV
     ? `ws://${window.location.hostname}:8000/stream`
-    : `ws://${window.location.host}/stream`;
+    : `ws://${window.location.host}/stream`) + (AGENT_ID ? `?agent=${encodeURIComponent(AGENT_ID)}` : '');
 
 export default function App() {
     const [callActive, setCallActive] = useState(false);
@@ -35,7 +36,7 @@ export default function App() {
     // Azure Speech callback — sends each utterance to the backend
     const onAzureTranscript = useCallback(
         (event) => {
-            sendMessage(event.text, event.isFinal, event.speaker, event.offset);
+            sendMessage(event.text, event.isFinal, event.speaker, event.offset, event.duration);
         },
         [sendMessage]
     );
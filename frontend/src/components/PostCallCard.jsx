@@ -17,6 +17,7 @@ export default function PostCallCard({ evaluation }) {
         total_utterances,
         agent_utterances,
         customer_utterances,
+        analytics,
     } = evaluation;
 
     const getScoreColor = (score) => {
@@ -88,6 +89,18 @@ export default function PostCallCard({ evaluation }) {
                         <span className="metric-value">{customer_utterances || 0}</span>
                         <span className="metric-label">Customer</span>
                     </div>
+                    {analytics?.checklist && (
+                        <div className="metric">
+                            <span className="metric-value">{Math.round(analytics.checklist.coverage * 100)}%</span>
+                            <span className="metric-label">FNOL Checklist</span>
+                        </div>
+                    )}
+                    {analytics?.agent_response_latency_seconds && (
+                        <div className="metric">
+                            <span className="metric-value">{analytics.agent_response_latency_seconds.mean}s</span>
+                            <span className="metric-label">Avg Response</span>
+                        </div>
+                    )}
                 </div>
 
                 {/* Category Scores */}
@@ -20,6 +20,8 @@ export function useWebSocket(url) {
 
     const wsRef = useRef(null);
     const reconnectTimerRef = useRef(null);
+    // Profiles already received, by policyId — the server sends refs/deltas against these
+    const profileCacheRef = useRef(new Map());
 
     const connect = useCallback(() => {
         if (wsRef.current?.readyState === WebSocket.OPEN) return;
@@ -85,9 +87,25 @@ export function useWebSocket(url) {
                 break;
 
             case 'member_profile':
+                profileCacheRef.current.set(data.policyId, data);
                 setMemberProfile(data);
                 break;
 
+            case 'member_profile_ref': {
+                const cached = profileCacheRef.current.get(data.policyId);
+                if (cached) setMemberProfile(cached);
+                break;
+            }
+
+            case 'member_profile_delta': {
+                const base = profileCacheRef.current.get(data.policyId) || {};
+                const updated = { ...base, ...data.changes };
+                data.removed.forEach((field) => delete updated[field]);
+                profileCacheRef.current.set(data.policyId, updated);
+                setMemberProfile(updated);
+                break;
+            }
+
             case 'knowledge':
                 setKnowledgeDocs(data);
                 break;
@@ -96,6 +114,13 @@ export function useWebSocket(url) {
                 setComplianceAlerts(data);
                 break;
 
+            case 'compliance_update':
+                setComplianceAlerts((prev) => [
+                    ...prev.filter((a) => !data.resolved.includes(a.ruleId)),
+                    ...data.fired,
+                ]);
+                break;
+
             case 'suggestion':
                 setSuggestion(data.text);
                 setIsProcessing(false);
@@ -125,13 +150,14 @@ export function useWebSocket(url) {
         }
     }, []);
 
-    const sendMessage = useCallback((text, isFinalized = true, speaker = 'Unknown', offset = 0) => {
+    const sendMessage = useCallback((text, isFinalized = true, speaker = 'Unknown', offset = 0, duration = null) => {
         if (wsRef.current?.readyState === WebSocket.OPEN) {
             wsRef.current.send(JSON.stringify({
                 text,
                 is_finalized: isFinalized,
                 speaker,
                 offset,
+                duration,
             }));
         }
     }, []);
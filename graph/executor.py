@@ -0,0 +1,70 @@
+# graph/executor.py — Minimal asyncio DAG executor (LangGraph-free alternative)
+
+import asyncio
+from typing import Awaitable, Callable
+
+Node = Callable[[dict], Awaitable[dict]]
+
+
+class AsyncDAG:
+    """
+    Runs async node functions over a shared state dict.
+
+    Each node starts as soon as all of its upstream nodes have finished and
+    merges its returned dict into the state, so independent branches fan out
+    as concurrent tasks and a node with several inputs is a true join (it runs
+    once, after every input). Nodes must write disjoint keys — true for the
+    FNOL pipeline, where each node owns its outputs.
+
+    Exposes ainvoke() like a compiled LangGraph so callers don't care which
+    backend they got.
+    """
+
+    def __init__(self, nodes: dict[str, Node], edges: list[tuple[str, str]]):
+        self._nodes = nodes
+        self._upstream: dict[str, list[str]] = {name: [] for name in nodes}
+        for source, target in edges:
+            self._upstream[target].append(source)
+        self._order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at node {name!r}")
+            visiting.add(name)
+            for upstream in self._upstream[name]:
+                visit(upstream)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self._nodes:
+            visit(name)
+        return order
+
+    async def ainvoke(self, state: dict) -> dict:
+        state = dict(state)
+        done: dict[str, asyncio.Future] = {}
+
+        async def run(name: str):
+            upstream = self._upstream[name]
+            if upstream:
+                await asyncio.gather(*(done[u] for u in upstream))
+            state.update(await self._nodes[name](state) or {})
+
+        # Topological order guarantees every upstream task exists before it is awaited
+        for name in self._order:
+            done[name] = asyncio.ensure_future(run(name))
+        try:
+            await asyncio.gather(*done.values())
+        except BaseException:
+            for task in done.values():
+                task.cancel()
+            # Let the siblings finish cancelling (and retrieve their errors) before re-raising
+            await asyncio.gather(*done.values(), return_exceptions=True)
+            raise
+        return state
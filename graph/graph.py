@@ -1,6 +1,7 @@
-# graph/graph.py — LangGraph state machine for FNOL processing
+# graph/graph.py — FNOL processing pipeline (LangGraph or native asyncio executor)
+
+import os
 
-from langgraph.graph import StateGraph
 from graph.state import AgentState
 from graph.nodes import (
     intent_node,
@@ -11,10 +12,39 @@ from graph.nodes import (
     suggestion_node,
 )
 
+# "langgraph" → compiled StateGraph; "native" → graph/executor.AsyncDAG (same nodes, same topology)
+GRAPH_BACKEND = os.getenv("GRAPH_BACKEND", "langgraph")
+
+# ─── Topology shared by both backends ─── #
+NODES = {
+    "intent": intent_node,
+    "entity": entity_node,
+    "knowledge": knowledge_node,
+    "compliance": compliance_node,
+    "member": member_node,
+    "suggestion": suggestion_node,
+}
+
+EDGES = [
+    # After intent → fan out to three parallel branches
+    ("intent", "entity"),
+    ("intent", "knowledge"),
+    ("intent", "compliance"),
+    # Entity → member lookup
+    ("entity", "member"),
+    # All branches merge into suggestion
+    ("member", "suggestion"),
+    ("knowledge", "suggestion"),
+    ("compliance", "suggestion"),
+]
+
+ENTRY = "intent"
+FINISH = "suggestion"
+
 
-def build_graph():
+def build_graph(backend: str | None = None):
     """
-    Build the LangGraph processing pipeline.
+    Build the processing pipeline.
 
     Flow:
         intent ──┬──> entity ──> member ──┐
@@ -22,33 +52,36 @@ def build_graph():
                  └──> compliance ─────────┘
                                           └──> suggestion
     """
+    backend = (backend or GRAPH_BACKEND).lower()
+    if backend == "native":
+        from graph.executor import AsyncDAG
+        return AsyncDAG(NODES, EDGES)
+    if backend == "langgraph":
+        return _build_langgraph()
+    raise ValueError(f"Unknown GRAPH_BACKEND: {backend!r}")
+
+
+def _build_langgraph():
+    from langgraph.graph import StateGraph
+
     builder = StateGraph(AgentState)
 
     # Register all nodes
-    builder.add_node("intent", intent_node)
-    builder.add_node("entity", entity_node)
-    builder.add_node("knowledge", knowledge_node)
-    builder.add_node("compliance", compliance_node)
-    builder.add_node("member", member_node)
-    builder.add_node("suggestion", suggestion_node)
+    for name, node in NODES.items():
+        builder.add_node(name, node)
 
     # Entry point
-    builder.set_entry_point("intent")
-
-    # After intent → fan out to three parallel branches
-    builder.add_edge("intent", "entity")
-    builder.add_edge("intent", "knowledge")
-    builder.add_edge("intent", "compliance")
-
-    # Entity → member lookup
-    builder.add_edge("entity", "member")
+    builder.set_entry_point(ENTRY)
 
-    # All branches merge into suggestion
-    builder.add_edge("member", "suggestion")
-    builder.add_edge("knowledge", "suggestion")
-    builder.add_edge("compliance", "suggestion")
+    # Single-input edges; a node with several inputs becomes one waiting edge,
+    # otherwise LangGraph would run it once per finished input
+    upstream: dict[str, list[str]] = {}
+    for source, target in EDGES:
+        upstream.setdefault(target, []).append(source)
+    for target, sources in upstream.items():
+        builder.add_edge(sources if len(sources) > 1 else sources[0], target)
 
     # Finish
-    builder.set_finish_point("suggestion")
+    builder.set_finish_point(FINISH)
 
     return builder.compile()
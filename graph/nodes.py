@@ -1,9 +1,11 @@
 # graph/nodes.py — LangGraph node functions for Insurance FNOL
 
 import re
-from data.members import get_member
+from data.call_analytics import claim_category
+from data.members import get_member, find_members_by_name
 from data.knowledge import search_knowledge, get_compliance_alerts
 from tools.llm import classify_intent, generate_agent_suggestion, extract_entities
+from tools.routing import LLMDeadlineExceeded
 
 
 # ─────────────── INTENT NODE ─────────────── #
@@ -13,7 +15,11 @@ async def intent_node(state: dict) -> dict:
     Classify the caller's intent using the LLM.
     Returns intent and claim_type.
     """
-    result = await classify_intent(state["transcript"])
+    try:
+        result = await classify_intent(state["transcript"])
+    except LLMDeadlineExceeded:
+        # Leave the call's last known intent in place
+        return {"intent": None, "claim_type": None}
     return {
         "intent": result.get("intent", "general_inquiry"),
         "claim_type": result.get("claim_type", "general"),
@@ -27,7 +33,10 @@ async def entity_node(state: dict) -> dict:
     Extract policy IDs, names, and phones from the transcript using LLM.
     """
     text = state["transcript"]
-    entities = await extract_entities(text)
+    try:
+        entities = await extract_entities(text)
+    except LLMDeadlineExceeded:
+        return {"entities": {}}
 
     # Clean up empty entities to keep state clean
     cleaned_entities = {k: v for k, v in entities.items() if v is not None}
@@ -40,9 +49,12 @@ async def entity_node(state: dict) -> dict:
 async def member_node(state: dict) -> dict:
     """
     Fetch policyholder details from mock CRM using extracted entities.
+    If only a name was heard and no member matched confidently, the ranked
+    fuzzy candidates are passed on so the agent can confirm with the caller.
     """
     entities = state.get("entities") or {}
     member = None
+    candidates = None
 
     if entities:
         member = get_member(
@@ -50,8 +62,10 @@ async def member_node(state: dict) -> dict:
             name=entities.get("name"),
             phone=entities.get("phone")
         )
+        if member is None and entities.get("name"):
+            candidates = find_members_by_name(entities["name"], limit=3) or None
 
-    return {"member_data": member}
+    return {"member_data": member, "member_candidates": candidates}
 
 
 # ─────────────── KNOWLEDGE NODE ─────────────── #
@@ -69,10 +83,25 @@ async def knowledge_node(state: dict) -> dict:
 async def compliance_node(state: dict) -> dict:
     """
     Match compliance rules based on the detected claim type and transcript.
+    With a per-call tracker only the newly fired/resolved rules are reported;
+    compliance_alerts is still the full active list for the suggestion.
+    Rules are scoped by the call's claim line: an utterance classified as
+    general (or not classified at all) keeps the call-level claim type.
     """
-    claim_type = state.get("claim_type") or state.get("intent") or ""
-    alerts = get_compliance_alerts(claim_type, state["transcript"])
-    return {"compliance_alerts": alerts}
+    claim_type = state.get("claim_type") or state.get("intent")
+    if claim_category(claim_type) == "general":
+        claim_type = state.get("call_claim_type") or state.get("call_intent") or claim_type
+    claim_type = claim_type or ""
+    tracker = state.get("compliance_tracker")
+    if tracker is None:
+        alerts = get_compliance_alerts(claim_type, state["transcript"])
+        return {"compliance_alerts": alerts}
+
+    fired, resolved = tracker.update(state["transcript"], state.get("speaker"), claim_type)
+    return {
+        "compliance_alerts": tracker.active_alerts,
+        "compliance_update": {"fired": fired, "resolved": resolved},
+    }
 
 
 # ─────────────── SUGGESTION NODE ─────────────── #
@@ -82,11 +111,16 @@ async def suggestion_node(state: dict) -> dict:
     Generate a suggested response for the agent using the LLM.
     Combines all gathered context into a coherent recommendation.
     """
-    suggestion = await generate_agent_suggestion(
-        transcript=state["transcript"],
-        intent=state.get("intent"),
-        member_data=state.get("member_data"),
-        knowledge_docs=state.get("knowledge_docs"),
-        compliance_alerts=state.get("compliance_alerts"),
-    )
+    try:
+        suggestion = await generate_agent_suggestion(
+            transcript=state["transcript"],
+            intent=state.get("intent"),
+            member_data=state.get("member_data"),
+            member_candidates=state.get("member_candidates"),
+            knowledge_docs=state.get("knowledge_docs"),
+            compliance_alerts=state.get("compliance_alerts"),
+        )
+    except LLMDeadlineExceeded:
+        # Never hold the other cards back for a late suggestion
+        return {"suggestion": None}
     return {"suggestion": suggestion}
@@ -1,19 +1,27 @@
 # graph/state.py — LangGraph Agent State for Insurance FNOL
 
-from typing import TypedDict, Optional
+from typing import Any, TypedDict, Optional
 
 
 class AgentState(TypedDict):
     transcript: str
     is_finalized: bool
+    speaker: Optional[str]
+
+    # Per-call state carried across utterances
+    compliance_tracker: Optional[Any]
+    call_intent: Optional[str]
+    call_claim_type: Optional[str]
 
     # Processing outputs
     intent: Optional[str]
     claim_type: Optional[str]
     entities: Optional[dict]
     member_data: Optional[dict]
+    member_candidates: Optional[list[dict]]
     knowledge_docs: Optional[list[dict]]
     compliance_alerts: Optional[list[dict]]
+    compliance_update: Optional[dict]
 
     # Final output
     suggestion: Optional[str]
@@ -2,37 +2,90 @@
 
 import re
 import json
+import asyncio
 import logging
+import sys
 import time
+import uuid
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 
+from data.archive import CallArchive
+from data.call_analytics import CallAnalytics, claim_category
+from data.compliance import ComplianceTracker
 from data.members import get_member
+from data.member_views import MemberProfileSync
+from data.knowledge import knowledge_base, compliance_rules
 from graph.graph import build_graph
-from tools.llm import generate_post_call_evaluation
+from graph.nodes import knowledge_node, compliance_node
+from tools.admission import AdmissionController
+from tools.llm import (
+    generate_post_call_evaluation, degraded_post_call_evaluation, call_usage, get_client, get_router,
+)
+from tools.loop_monitor import LoopLagMonitor, sample_stacks
+from tools.pubsub import EventHub, SEVERITY_ORDER
+from tools.routing import LLMDeadlineExceeded
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("call-intelligence")
 
-# ─── Build the LangGraph at startup ─── #
+# ─── Pipeline is built in the background once the server is live ─── #
 graph = None
+warmup_task: asyncio.Task | None = None
+frontend_files = None  # PrecompressedStaticFiles when frontend/dist exists (see bottom)
 
+# ─── Persistent archive of completed calls ─── #
+archive = CallArchive()
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+# ─── Per-worker load limits (calls, LangGraph runs, LLM budget) ─── #
+admission = AdmissionController()
+
+# ─── Live call events for supervisors (per worker, in-process) ─── #
+hub = EventHub()
+
+# ─── Event-loop lag / stall watchdog (one loop per worker) ─── #
+loop_monitor = LoopLagMonitor()
+
+
+def _warm_up():
+    """Heavy imports and data loads. Runs on a worker thread so /health/live answers meanwhile."""
     global graph
-    logger.info("🚀 Building LangGraph pipeline...")
+    knowledge_base()
+    compliance_rules()
+    get_client()
     graph = build_graph()
-    logger.info("✅ LangGraph ready. Server is live.")
+    if frontend_files is not None:
+        frontend_files.load()
+
+
+async def _warm_up_in_background():
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_warm_up)
+        logger.info(f"✅ Pipeline ready in {time.perf_counter() - started:.2f}s.")
+    except Exception as e:
+        logger.error(f"❌ Pipeline warm-up failed — serving degraded: {e}", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global warmup_task
+    await archive.start()
+    loop_monitor.start()
+    logger.info("🚀 Server is live. Building pipeline in the background...")
+    warmup_task = asyncio.create_task(_warm_up_in_background())
     yield
     logger.info("🛑 Server shutting down.")
+    warmup_task.cancel()
+    await loop_monitor.stop()
+    await archive.close()
 
 
 app = FastAPI(
@@ -55,16 +108,66 @@ app.add_middleware(
 POLICY_REGEX = re.compile(r"\b(CAR|LIFE)[-\s]?(\d{4,})\b", re.IGNORECASE)
 
 
-# ─── Health check ─── #
+# ─── Health checks ─── #
 @app.get("/health")
 async def health():
-    return {"status": "ok", "graph_ready": graph is not None}
+    return {
+        "status": "ok",
+        "graph_ready": graph is not None,
+        "load": admission.snapshot(),
+        "llm_routes": get_router().snapshot(),
+        "event_loop": loop_monitor.snapshot(),
+        "supervisors": hub.snapshot(),
+    }
+
+
+@app.get("/health/live")
+async def health_live():
+    """The process is up and serving requests."""
+    return {"status": "live"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """The pipeline is built and the LLM client is initialized — route calls here."""
+    if graph is None:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
+# ─── Call archive (QA analytics) ─── #
+@app.get("/api/calls")
+async def list_calls(
+    policy_id: str | None = None,
+    intent: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+):
+    """Past calls with their evaluations. Dates are YYYY-MM-DD (UTC), inclusive."""
+    return await archive.query(
+        policy_id=policy_id,
+        intent=intent,
+        date_from=date_from,
+        date_to=date_to,
+        limit=min(max(limit, 1), 500),
+        offset=max(offset, 0),
+    )
+
+
+@app.get("/api/calls/{call_id}")
+async def get_call(call_id: str):
+    """A single archived call, including the full transcript."""
+    call = await archive.get(call_id)
+    if call is None:
+        raise HTTPException(status_code=404, detail="Call not found")
+    return call
 
 
 # ─── Azure Speech Token Endpoint ─── #
 # The frontend fetches a short-lived token from here instead of holding the key
 import os
-import httpx
 
 @app.get("/api/speech-token")
 async def get_speech_token():
@@ -82,6 +185,8 @@ async def get_speech_token():
 
     token_url = f"https://{speech_region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
 
+    import httpx  # only this endpoint needs it; keep it off the import path
+
     async with httpx.AsyncClient() as client:
         response = await client.post(
             token_url,
@@ -101,19 +206,70 @@ async def get_speech_token():
         return {"error": "Failed to fetch speech token"}, 500
 
 
+# ─── Debug: on-demand sampling profiler (off unless DEBUG_ENDPOINTS=1) ─── #
+DEBUG_ENDPOINTS = os.getenv("DEBUG_ENDPOINTS", "0") == "1"
+profile_lock = asyncio.Lock()
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def debug_profile(seconds: float = 5.0, hz: float = 100.0, all_threads: bool = False):
+    """
+    Sample stacks for a few seconds and return collapsed stacks
+    (feed to flamegraph.pl or paste into speedscope.app).
+    By default only the event-loop thread is sampled.
+    """
+    if not DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already being captured")
+    async with profile_lock:
+        thread_id = None if all_threads else loop_monitor.loop_thread_id
+        return await asyncio.to_thread(
+            sample_stacks, min(max(seconds, 0.1), 30.0), min(max(hz, 1.0), 1000.0), thread_id
+        )
+
+
 
 # ─── WebSocket endpoint for real-time streaming ─── #
 @app.websocket("/stream")
 async def stream_endpoint(websocket: WebSocket):
+    if not admission.try_admit_call():
+        logger.warning("🚦 Call limit reached — refusing WebSocket")
+        # Closing before accept() would fail the handshake with a bare 403;
+        # accept first so the client actually receives 1013 (Try Again Later)
+        await websocket.accept()
+        await websocket.close(code=1013)
+        return
+
     await websocket.accept()
-    logger.info("📞 WebSocket connected")
+    agent_id = websocket.query_params.get("agent")
+    logger.info(f"📞 WebSocket connected (agent: {agent_id or 'unknown'})")
 
     # Track full call transcript for post-call analysis
+    call_id = uuid.uuid4().hex
     call_transcript: list[dict] = []
     call_start_time = time.time()
     detected_intent = None
+    detected_claim_type = None
+    # The call's claim line: only a specific car/life classification moves it, so a
+    # "general" line ("Is everyone safe?") or a timed-out classification doesn't
+    call_intent = None
+    call_claim_type = None
     detected_member = None
 
+    # LLM tokens spent on this call, checked against the per-call budget
+    usage = {"calls": 0, "total_tokens": 0}
+    call_usage.set(usage)
+
+    # What member profiles this client already holds (sends full/ref/delta frames)
+    profile_sync = MemberProfileSync()
+
+    # Rolling compliance state — only changes are sent to the client
+    compliance = ComplianceTracker()
+
+    # Talk time, silence, response latency, FNOL checklist — feeds the post-call prompt
+    analytics = CallAnalytics()
+
     try:
         while True:
             raw = await websocket.receive_text()
@@ -132,18 +288,57 @@ async def stream_endpoint(websocket: WebSocket):
                 })
 
                 call_duration = time.time() - call_start_time
-                evaluation = await generate_post_call_evaluation(
-                    transcript_lines=call_transcript,
-                    call_duration=call_duration,
-                    detected_intent=detected_intent,
-                    member_data=detected_member,
-                )
+                # Scored and archived by what the call was about, not by its last line
+                final_intent = call_intent or detected_intent
+                final_claim_type = call_claim_type or detected_claim_type
+                call_facts = analytics.summary(final_claim_type or final_intent)
+                try:
+                    evaluation = await generate_post_call_evaluation(
+                        transcript_lines=call_transcript,
+                        call_duration=call_duration,
+                        detected_intent=final_intent,
+                        member_data=detected_member,
+                        analytics=call_facts,
+                        claim_type=final_claim_type,
+                    )
+                except Exception as e:
+                    if not (_is_llm_failure(e) or isinstance(e, LLMDeadlineExceeded)):
+                        raise
+                    # Keep the call (and the socket): send and archive what was measured locally
+                    logger.warning(f"🚦 Post-call evaluation unavailable ({type(e).__name__}) — analytics only")
+                    admission.note_llm_overload()
+                    evaluation = degraded_post_call_evaluation(
+                        transcript_lines=call_transcript,
+                        call_duration=call_duration,
+                        detected_intent=final_intent,
+                        analytics=call_facts,
+                        claim_type=final_claim_type,
+                    )
 
                 await websocket.send_json({
                     "type": "post_call_evaluation",
                     "data": evaluation,
                 })
                 logger.info("📋 Post-call evaluation sent")
+
+                _archive_call(call_id, call_start_time, call_transcript, final_intent, detected_member, evaluation)
+                if call_transcript:
+                    hub.end_call(call_id, {"overall_score": evaluation.get("overall_score")}, agent_id, final_intent)
+
+                # The socket stays open for the next call — start fresh
+                call_id = uuid.uuid4().hex
+                call_transcript = []
+                call_start_time = time.time()
+                detected_intent = None
+                detected_claim_type = None
+                call_intent = None
+                call_claim_type = None
+                detected_member = None
+                usage = {"calls": 0, "total_tokens": 0}
+                call_usage.set(usage)
+                profile_sync.reset()
+                compliance = ComplianceTracker()
+                analytics = CallAnalytics()
                 continue
 
             # ═══════════════════════════════════════════
@@ -153,6 +348,7 @@ async def stream_endpoint(websocket: WebSocket):
             is_finalized: bool = data.get("is_finalized", False)
             speaker: str = data.get("speaker", "Unknown")
             offset: int = data.get("offset", 0)
+            duration: int | None = data.get("duration")
 
             if not text.strip():
                 continue
@@ -167,13 +363,18 @@ async def stream_endpoint(websocket: WebSocket):
 
             # Store in call transcript (only finalized)
             if is_finalized:
+                # Supervisors see a call once someone speaks, not for every open agent tab
+                if not call_transcript:
+                    hub.publish(call_id, "call", {"status": "live", "started_at": call_start_time}, agent=agent_id)
                 timestamp = _format_timestamp(offset)
                 call_transcript.append({
                     "speaker": speaker_label,
                     "text": text,
                     "timestamp": timestamp,
                     "offset": offset,
+                    "duration": duration,
                 })
+                analytics.add(speaker_label, text, offset, duration)
 
             # ═══════════════════════════════════════════
             # ⚡ FAST PATH — Regex policy ID extraction
@@ -185,38 +386,57 @@ async def stream_endpoint(websocket: WebSocket):
                 member = get_member(policy_id=policy_id)
                 if member:
                     detected_member = member
-                    await websocket.send_json({
-                        "type": "member_profile",
-                        "data": member,
-                    })
-                    logger.info(f"⚡ Fast path: sent profile for {policy_id}")
+                    frame = profile_sync.frame_for(member)
+                    if frame:
+                        await websocket.send_text(frame)
+                        logger.info(f"⚡ Fast path: sent profile for {policy_id}")
 
             # ═══════════════════════════════════════════
             # 🧠 SLOW PATH — LangGraph (only on finalized)
             # ═══════════════════════════════════════════
-            if is_finalized and graph:
-                await websocket.send_json({
-                    "type": "processing",
-                    "data": {"message": "Analyzing transcript..."},
-                })
-
+            if is_finalized:
                 state = {
                     "transcript": text,
                     "is_finalized": True,
+                    "speaker": speaker_label,
+                    "compliance_tracker": compliance,
+                    "call_intent": call_intent,
+                    "call_claim_type": call_claim_type,
                     "intent": None,
                     "claim_type": None,
                     "entities": None,
                     "member_data": None,
+                    "member_candidates": None,
                     "knowledge_docs": None,
                     "compliance_alerts": None,
+                    "compliance_update": None,
                     "suggestion": None,
                 }
 
-                result = await graph.ainvoke(state)
+                if graph and admission.try_acquire_slow_path(usage):
+                    await websocket.send_json({
+                        "type": "processing",
+                        "data": {"message": "Analyzing transcript..."},
+                    })
+                    try:
+                        result = await graph.ainvoke(state)
+                    except Exception as e:
+                        if not _is_llm_failure(e):
+                            raise
+                        logger.warning(f"🚦 LLM unavailable after all routes ({type(e).__name__}) — degrading")
+                        admission.note_llm_overload()
+                        result = await _run_degraded(state, detected_intent, detected_claim_type)
+                    finally:
+                        admission.release_slow_path()
+                else:
+                    result = await _run_degraded(state, detected_intent, detected_claim_type)
 
                 # Track detected intent
-                if result.get("intent"):
+                if result.get("intent") and not result.get("degraded"):
                     detected_intent = result["intent"]
+                    detected_claim_type = result.get("claim_type")
+                    if claim_category(detected_claim_type or detected_intent) != "general":
+                        call_intent, call_claim_type = detected_intent, detected_claim_type
                     await websocket.send_json({
                         "type": "intent",
                         "data": {
@@ -224,14 +444,19 @@ async def stream_endpoint(websocket: WebSocket):
                             "claim_type": result.get("claim_type", ""),
                         },
                     })
-
-                # Send member data (slow path backup)
+                    # Supervisors filter on the call's claim line, not on one general-sounding utterance
+                    hub.publish(
+                        call_id, "intent",
+                        {"intent": call_intent or detected_intent, "claim_type": call_claim_type or detected_claim_type},
+                        agent_id, call_intent or detected_intent,
+                    )
+
+                # Send member data (slow path backup) — only if the client doesn't have it
                 if result.get("member_data"):
                     detected_member = result["member_data"]
-                    await websocket.send_json({
-                        "type": "member_profile",
-                        "data": result["member_data"],
-                    })
+                    frame = profile_sync.frame_for(detected_member)
+                    if frame:
+                        await websocket.send_text(frame)
 
                 # Send knowledge articles
                 if result.get("knowledge_docs"):
@@ -240,12 +465,20 @@ async def stream_endpoint(websocket: WebSocket):
                         "data": result["knowledge_docs"],
                     })
 
-                # Send compliance alerts
-                if result.get("compliance_alerts"):
+                # Send newly fired / resolved compliance alerts
+                update = result.get("compliance_update")
+                if update and (update["fired"] or update["resolved"]):
                     await websocket.send_json({
-                        "type": "compliance",
-                        "data": result["compliance_alerts"],
+                        "type": "compliance_update",
+                        "data": update,
                     })
+                    active = compliance.active_alerts
+                    hub.publish(
+                        call_id, "compliance",
+                        [{"ruleId": a["ruleId"], "title": a["title"], "severity": a["severity"]} for a in active],
+                        agent_id, call_intent or detected_intent,
+                        severity=max((a["severity"] for a in active), key=SEVERITY_ORDER.get, default=None),
+                    )
 
                 # Send suggested response
                 if result.get("suggestion"):
@@ -253,6 +486,7 @@ async def stream_endpoint(websocket: WebSocket):
                         "type": "suggestion",
                         "data": {"text": result["suggestion"]},
                     })
+                    hub.publish(call_id, "suggestion", {"text": result["suggestion"]}, agent_id, call_intent or detected_intent)
 
                 logger.info("🧠 Slow path: all cards sent")
 
@@ -279,6 +513,99 @@ async def stream_endpoint(websocket: WebSocket):
             })
         except Exception:
             pass
+    finally:
+        admission.release_call()
+        # Calls dropped without "end_call" are archived without an evaluation
+        if call_transcript:
+            hub.end_call(call_id, {}, agent_id, call_intent or detected_intent)
+            _archive_call(call_id, call_start_time, call_transcript, call_intent or detected_intent, detected_member, None)
+
+
+# ─── Supervisor view: filtered fan-out of every live call ─── #
+@app.websocket("/supervisor")
+async def supervisor_endpoint(websocket: WebSocket):
+    """
+    Streams intent, compliance and suggestion events from all live calls on
+    this worker. Optional filters: ?intent=car_accident,car_theft
+    &severity=high (minimum, compliance events only) &agent=a1,a2
+    Calls that drift out of the filters are retracted (see Subscription).
+    """
+    params = websocket.query_params
+    await websocket.accept()
+    sub = hub.subscribe(
+        intents=_csv_param(params.get("intent")),
+        min_severity=params.get("severity"),
+        agents=_csv_param(params.get("agent")),
+    )
+    logger.info(f"👀 Supervisor connected ({hub.subscriber_count} watching)")
+
+    async def pump():
+        while True:
+            await websocket.send_text(await sub.next_frame())
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        # Supervisors don't send anything; receiving only tells us when they leave
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        logger.info("👀 Supervisor disconnected")
+    finally:
+        hub.unsubscribe(sub)
+        pump_task.cancel()
+        try:
+            await pump_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # The socket went away mid-send; the receive side already noticed
+            logger.debug(f"👀 Supervisor send loop ended: {e}")
+
+
+def _csv_param(value: str | None) -> set[str] | None:
+    values = {v.strip() for v in (value or "").split(",") if v.strip()}
+    return values or None
+
+
+def _is_llm_failure(exc: Exception) -> bool:
+    """
+    An OpenAI API error (429, 5xx, connection, timeout) that survived every
+    route in the router. openai is only looked up if it's already loaded —
+    if it isn't, nothing could have raised one.
+    """
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(exc, openai.APIError)
+
+
+async def _run_degraded(state: dict, intent: str | None, claim_type: str | None) -> dict:
+    """
+    Local-only pipeline for when the LLM tier is saturated or the call is over
+    its token budget: knowledge + compliance from the last known intent, no LLM.
+    """
+    state = {**state, "intent": intent, "claim_type": claim_type}
+    knowledge, compliance = await asyncio.gather(knowledge_node(state), compliance_node(state))
+    logger.info("🚦 Slow path degraded: local knowledge/compliance only")
+    return {**state, **knowledge, **compliance, "degraded": True}
+
+
+def _archive_call(
+    call_id: str,
+    started_at: float,
+    transcript: list[dict],
+    intent: str | None,
+    member: dict | None,
+    evaluation: dict | None,
+) -> None:
+    """Hand a finished call to the archive writer (non-blocking)."""
+    archive.submit({
+        "call_id": call_id,
+        "started_at": started_at,
+        "ended_at": time.time(),
+        "transcript": transcript,
+        "intent": intent,
+        "member": member,
+        "evaluation": evaluation,
+    })
 
 
 def _map_speaker(speaker_id: str) -> str:
@@ -303,12 +630,28 @@ def _format_timestamp(offset_ticks: int) -> str:
 
 
 # ─── Serve frontend static files (production) ─── #
-import os
+# "precompressed" → gzip/br variants, ETags, immutable caching for hashed assets
+# "plain"         → Starlette StaticFiles + FileResponse, no compression or cache policy
+STATIC_MODE = os.getenv("STATIC_MODE", "precompressed")
 
 frontend_dist = os.path.join(os.path.dirname(__file__), "frontend", "dist")
-if os.path.isdir(frontend_dist):
+if os.path.isdir(frontend_dist) and STATIC_MODE == "plain":
     app.mount("/assets", StaticFiles(directory=os.path.join(frontend_dist, "assets")), name="assets")
 
     @app.get("/")
     async def serve_frontend():
         return FileResponse(os.path.join(frontend_dist, "index.html"))
+
+elif os.path.isdir(frontend_dist):
+    from tools.static_assets import PrecompressedStaticFiles
+
+    frontend_files = PrecompressedStaticFiles(frontend_dist)
+
+    # HEAD as well as GET, as StaticFiles answers both
+    @app.api_route("/assets/{path:path}", methods=["GET", "HEAD"])
+    async def serve_asset(request: Request, path: str):
+        return frontend_files.response(request, f"assets/{path}")
+
+    @app.api_route("/", methods=["GET", "HEAD"])
+    async def serve_frontend(request: Request):
+        return frontend_files.response(request, "index.html")
@@ -0,0 +1,82 @@
+# tools/admission.py — Admission control and load accounting for /stream
+
+import os
+import time
+
+
+class AdmissionController:
+    """
+    Per-worker limits that keep a traffic spike from degrading every call:
+
+    - max_calls:        concurrent WebSocket calls; extra connections are refused
+    - max_slow_path:    concurrent LangGraph runs; extra utterances run degraded
+    - call_token_budget LLM tokens one call may spend before it runs degraded
+    - overload_cooldown seconds to stay degraded after the LLM tier returns 429s
+
+    "Degraded" means fast path + local knowledge/compliance only, no LLM calls.
+    Everything runs on one event loop, so plain counters are race-free.
+    """
+
+    def __init__(
+        self,
+        max_calls: int = int(os.getenv("MAX_CONCURRENT_CALLS", "200")),
+        max_slow_path: int = int(os.getenv("MAX_CONCURRENT_SLOW_PATH", "32")),
+        call_token_budget: int = int(os.getenv("CALL_LLM_TOKEN_BUDGET", "60000")),
+        overload_cooldown: float = float(os.getenv("LLM_OVERLOAD_COOLDOWN", "5")),
+    ):
+        self.max_calls = max_calls
+        self.max_slow_path = max_slow_path
+        self.call_token_budget = call_token_budget
+        self.overload_cooldown = overload_cooldown
+
+        self.active_calls = 0
+        self.slow_path_in_flight = 0
+        self._overloaded_until = 0.0
+
+        self.rejected_calls = 0
+        self.degraded_runs = 0
+
+    # ─── Calls ─── #
+
+    def try_admit_call(self) -> bool:
+        if self.active_calls >= self.max_calls:
+            self.rejected_calls += 1
+            return False
+        self.active_calls += 1
+        return True
+
+    def release_call(self) -> None:
+        self.active_calls -= 1
+
+    # ─── Slow path (LLM tier) ─── #
+
+    def try_acquire_slow_path(self, usage: dict | None = None) -> bool:
+        """Reserve a LangGraph slot, or return False if this run should be degraded."""
+        over_budget = usage is not None and usage.get("total_tokens", 0) >= self.call_token_budget
+        if over_budget or self.llm_overloaded or self.slow_path_in_flight >= self.max_slow_path:
+            self.degraded_runs += 1
+            return False
+        self.slow_path_in_flight += 1
+        return True
+
+    def release_slow_path(self) -> None:
+        self.slow_path_in_flight -= 1
+
+    def note_llm_overload(self) -> None:
+        """The LLM tier pushed back (429) or failed on every route — degrade new runs for a while."""
+        self._overloaded_until = time.monotonic() + self.overload_cooldown
+
+    @property
+    def llm_overloaded(self) -> bool:
+        return time.monotonic() < self._overloaded_until
+
+    def snapshot(self) -> dict:
+        return {
+            "active_calls": self.active_calls,
+            "max_calls": self.max_calls,
+            "slow_path_in_flight": self.slow_path_in_flight,
+            "max_slow_path": self.max_slow_path,
+            "llm_overloaded": self.llm_overloaded,
+            "rejected_calls": self.rejected_calls,
+            "degraded_runs": self.degraded_runs,
+        }
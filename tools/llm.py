@@ -1,17 +1,138 @@
 # tools/llm.py — OpenAI LLM utilities for Insurance FNOL + Post-Call Evaluation
 
 import os
+from contextvars import ContextVar
 from typing import Literal
-from openai import AsyncOpenAI
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-load_dotenv()
+from data.call_analytics import CallAnalytics, claim_category
+from data.compliance import ComplianceTracker
+from tools.routing import ModelRouter, Route, load_routes
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+load_dotenv()
 
+# Default model; per-task choices and fallbacks live in tools/routing.py (LLM_ROUTES)
 MODEL = "gpt-4.1-mini"
 
+# "openai" → real API, or any compatible server via OPENAI_BASE_URL (e.g. tools/mock_server.py)
+# "mock"   → in-process deterministic stand-in (tools/mock_llm.py), no network at all
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+
+
+# SDK-level retries; the router fails over to alternate models instead of retrying for long
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "1"))
+
+
+def create_client(backend: str | None = None, base_url: str | None = None, api_key: str | None = None):
+    """
+    Build the chat-completions client for the given backend.
+    Any object exposing chat.completions.create and beta.chat.completions.parse
+    with the AsyncOpenAI signatures can be plugged in via set_client().
+    """
+    backend = (backend or LLM_BACKEND).lower()
+    if backend == "mock":
+        from tools.mock_llm import MockAsyncClient
+        return MockAsyncClient()
+    if backend == "openai":
+        from openai import AsyncOpenAI  # ~0.4s import — only paid when the first call needs it
+        return AsyncOpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            base_url=base_url or os.getenv("OPENAI_BASE_URL") or None,
+            max_retries=LLM_MAX_RETRIES,
+        )
+    raise ValueError(f"Unknown LLM_BACKEND: {backend!r}")
+
+
+_client = None
+
+
+def get_client():
+    """The shared client, created on first use so importing this module stays cheap."""
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+def set_client(new_client) -> None:
+    """Swap the backend at runtime (benchmarks, load tests)."""
+    global _client
+    _client = new_client
+
+
+# ═══════════════════════════════════════════════════════
+# MODEL ROUTING — per-task model choice, failover, deadlines
+# ═══════════════════════════════════════════════════════
+
+_endpoint_clients: dict[str, object] = {}
+_router: ModelRouter | None = None
+
+
+def _client_for(route: Route):
+    """Routes on the default endpoint share the main client; others get their own."""
+    if not route.base_url and not route.api_key_env:
+        return get_client()
+    key = f"{route.base_url}|{route.api_key_env}"
+    if key not in _endpoint_clients:
+        _endpoint_clients[key] = create_client(
+            base_url=route.base_url,
+            api_key=os.getenv(route.api_key_env) if route.api_key_env else None,
+        )
+    return _endpoint_clients[key]
+
+
+def get_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        _router = ModelRouter(load_routes(), client_for=_client_for)
+    return _router
+
+
+# ═══════════════════════════════════════════════════════
+# TOKEN USAGE — running totals per model, for cost reporting
+# ═══════════════════════════════════════════════════════
+
+# USD per 1M tokens: (input, output)
+PRICING = {
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+usage_totals: dict[str, dict] = {}
+
+# Per-call meter: stream_endpoint sets a dict here; graph nodes inherit it via the task context
+call_usage: ContextVar[dict | None] = ContextVar("call_usage", default=None)
+
+
+def _record_usage(response) -> None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    meter = call_usage.get()
+    if meter is not None:
+        meter["calls"] = meter.get("calls", 0) + 1
+        meter["total_tokens"] = meter.get("total_tokens", 0) + (usage.total_tokens or 0)
+    totals = usage_totals.setdefault(
+        response.model or MODEL, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    )
+    totals["calls"] += 1
+    totals["prompt_tokens"] += usage.prompt_tokens or 0
+    totals["completion_tokens"] += usage.completion_tokens or 0
+
+
+def estimate_cost(totals: dict[str, dict] | None = None) -> float:
+    """Estimated USD spend for the given (default: process-wide) usage totals."""
+    cost = 0.0
+    for model, t in (usage_totals if totals is None else totals).items():
+        # Dated snapshots ("gpt-4.1-mini-2025-04-14") price like their base model
+        base = next((m for m in sorted(PRICING, key=len, reverse=True) if model.startswith(m)), None)
+        if base:
+            price_in, price_out = PRICING[base]
+            cost += (t["prompt_tokens"] * price_in + t["completion_tokens"] * price_out) / 1_000_000
+    return cost
+
 
 # ═══════════════════════════════════════════════════════
 # PYDANTIC SCHEMAS — used by OpenAI Structured Outputs
@@ -71,16 +192,20 @@ Analyze the caller's statement and classify it.
 - "intent": the most fitting FNOL category.
 - "claim_type": the broad insurance line the intent falls under."""
 
-    response = await client.beta.chat.completions.parse(
-        model=MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": transcript},
-        ],
-        temperature=0.0,
-        max_tokens=100,
-        response_format=IntentClassification,
+    response = await get_router().run(
+        "intent",
+        lambda client, model: client.beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": transcript},
+            ],
+            temperature=0.0,
+            max_tokens=100,
+            response_format=IntentClassification,
+        ),
     )
+    _record_usage(response)
 
     return response.choices[0].message.parsed.model_dump()
 
@@ -99,16 +224,20 @@ Analyze the caller's statement and extract the following if present:
 - "phone": phone number referenced.
 Return null for fields not found."""
 
-    response = await client.beta.chat.completions.parse(
-        model=MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": transcript},
-        ],
-        temperature=0.0,
-        max_tokens=150,
-        response_format=EntityExtraction,
+    response = await get_router().run(
+        "entities",
+        lambda client, model: client.beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": transcript},
+            ],
+            temperature=0.0,
+            max_tokens=150,
+            response_format=EntityExtraction,
+        ),
     )
+    _record_usage(response)
 
     return response.choices[0].message.parsed.model_dump()
 
@@ -123,6 +252,7 @@ async def generate_agent_suggestion(
     member_data: dict | None,
     knowledge_docs: list[dict] | None,
     compliance_alerts: list[dict] | None,
+    member_candidates: list[dict] | None = None,
 ) -> str:
     """Generate a contextual suggested response for the call center agent."""
 
@@ -135,6 +265,7 @@ Rules:
 - Include specific next steps based on the knowledge articles provided.
 - Reference compliance requirements naturally (don't read compliance codes).
 - If member data is available, use their name in the script.
+- If only possible policyholder matches are listed, have the agent confirm the caller's name and policy number.
 - Keep the response concise (2-4 sentences max).
 - Start immediately with the script (e.g., "Hi [Name], I'm so sorry...")."""
 
@@ -144,7 +275,7 @@ Rules:
 Detected Intent: {intent or 'unknown'}
 
 Policyholder Data:
-{member_data or 'Not yet identified'}
+{member_data or _format_candidates(member_candidates)}
 
 Relevant Policy Articles:
 {_format_docs(knowledge_docs)}
@@ -154,15 +285,19 @@ Active Compliance Alerts:
 
 Generate the agent's suggested response:"""
 
-    response = await client.chat.completions.create(
-        model=MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.4,
-        max_tokens=300,
+    response = await get_router().run(
+        "suggestion",
+        lambda client, model: client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.4,
+            max_tokens=300,
+        ),
     )
+    _record_usage(response)
 
     return response.choices[0].message.content
 
@@ -171,72 +306,174 @@ Generate the agent's suggested response:"""
 # POST-CALL EVALUATION — Structured Output
 # ═══════════════════════════════════════════════════════
 
+# The QA rubric. Batch re-scoring (evaluate_batch.py) hashes this, so editing it
+# marks every archived call as due for re-evaluation.
+# Same for the "Call Facts" template (_evaluation_facts / _format_call_facts),
+# which can't be hashed from source: bump this whenever it changes.
+EVALUATION_FACTS_VERSION = 2
+EVALUATION_SYSTEM_PROMPT = """You are an insurance call center quality assurance analyst.
+Evaluate the agent's performance on an FNOL (First Notice of Loss) call.
+
+Scoring criteria:
+- Empathy: Did the agent show appropriate concern? Warm opening?
+- Information Gathering: Did they collect all required FNOL details (date, location, parties, damage, police report)?
+- Compliance: Privacy disclosures, call recording notice, no fault admission advice?
+- Process Knowledge: Did agent know the correct procedures and requirements?
+- Resolution: Clear next steps, timeline, follow-up expectations?
+
+The "Call Facts" are measured from the audio timeline and keyword matching — treat
+them as ground truth (especially the FNOL checklist for Information Gathering and
+unmet compliance obligations, i.e. required statements the agent never made, for
+Compliance) and use the transcript for tone and judgment.
+
+Scores use a 1-10 scale per category and 1-100 overall. Be brief: one sentence of
+feedback per category, at most 3 strengths and 3 improvements, coaching notes in
+two sentences or fewer."""
+
+# Compact speaker tags for the evaluation transcript
+_SPEAKER_TAGS = {"Agent": "A", "Customer": "C"}
+
+
 async def generate_post_call_evaluation(
     transcript_lines: list[dict],
     call_duration: float,
     detected_intent: str | None,
     member_data: dict | None,
+    analytics: dict | None = None,
+    claim_type: str | None = None,
 ) -> dict:
     """
     Generate a comprehensive post-call evaluation scorecard.
     Returns structured JSON with scores and feedback.
+
+    analytics is CallAnalytics.summary() from the live call; when omitted it is
+    rebuilt from the lines. claim_type (falling back to the intent) scopes the
+    FNOL checklist and compliance rules.
     """
+    analytics = _evaluation_facts(transcript_lines, analytics, claim_type or detected_intent)
 
-    # Format transcript for LLM
+    # Compact transcript — timing lives in the facts, not in per-line timestamps
     formatted_transcript = "\n".join(
-        f"[{line['speaker']} {line['timestamp']}]: \"{line['text']}\""
+        f"{_SPEAKER_TAGS.get(line['speaker'], line['speaker'])}: {line['text']}"
         for line in transcript_lines
     )
 
-    system_prompt = """You are an insurance call center quality assurance analyst.
-Evaluate the agent's performance on an FNOL (First Notice of Loss) call.
-
-Scoring criteria:
-- Empathy: Did the agent show appropriate concern? Warm opening?
-- Information Gathering: Did they collect all required FNOL details (date, location, parties, damage, police report)?
-- Compliance: Privacy disclosures, call recording notice, no fault admission advice?
-- Process Knowledge: Did agent know the correct procedures and requirements?
-- Resolution: Clear next steps, timeline, follow-up expectations?
-
-Scores use a 1-10 scale per category and 1-100 overall."""
+    user_prompt = f"""Call Facts:
+{_format_call_facts(analytics, call_duration, detected_intent, member_data)}
 
-    user_prompt = f"""Call Transcript:
+Transcript (A = Agent, C = Customer):
 {formatted_transcript}
 
-Call Duration: {int(call_duration)} seconds
-Detected Claim Type: {detected_intent or 'unknown'}
-Policyholder Identified: {member_data.get('name') if member_data else 'Not identified'}
-
 Evaluate this agent's performance:"""
 
-    response = await client.beta.chat.completions.parse(
-        model=MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=0.3,
-        max_tokens=800,
-        response_format=PostCallEvaluation,
+    response = await get_router().run(
+        "evaluation",
+        lambda client, model: client.beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "system", "content": EVALUATION_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.3,
+            max_tokens=500,
+            response_format=PostCallEvaluation,
+        ),
     )
+    _record_usage(response)
 
     evaluation = response.choices[0].message.parsed.model_dump()
+    return _with_call_metadata(evaluation, response.model, transcript_lines, call_duration, analytics)
+
 
-    # Add metadata
+def degraded_post_call_evaluation(
+    transcript_lines: list[dict],
+    call_duration: float,
+    detected_intent: str | None,
+    analytics: dict | None = None,
+    claim_type: str | None = None,
+) -> dict:
+    """
+    Analytics-only scorecard for when the LLM tier can't score the call:
+    the locally measured facts, unmet obligations as violations, no scores.
+    """
+    claim_type = claim_type or detected_intent
+    analytics = _evaluation_facts(transcript_lines, analytics, claim_type)
+    evaluation = {
+        "overall_score": None,
+        "call_summary": "Automatic scoring is unavailable right now; call metrics below are measured locally.",
+        "claim_type_detected": claim_category(claim_type),
+        "scores": {},
+        "strengths": [],
+        "improvements": [],
+        "compliance_violations": analytics["unmet_compliance_obligations"],
+        "coaching_notes": "",
+        "degraded": True,
+    }
+    return _with_call_metadata(evaluation, None, transcript_lines, call_duration, analytics)
+
+
+def _evaluation_facts(transcript_lines: list[dict], analytics: dict | None, claim_type: str | None) -> dict:
+    if analytics is None:
+        analytics = CallAnalytics.from_lines(transcript_lines).summary(claim_type)
+    # Replayed from the lines on the live and batch paths alike, so both score the same facts
+    unmet = ComplianceTracker.from_lines(transcript_lines, claim_category(claim_type)).unmet_obligations
+    return {**analytics, "unmet_compliance_obligations": [rule["title"] for rule in unmet]}
+
+
+def _with_call_metadata(
+    evaluation: dict, model: str | None, transcript_lines: list[dict], call_duration: float, analytics: dict
+) -> dict:
+    evaluation["model"] = model
     evaluation["call_duration_seconds"] = int(call_duration)
     evaluation["total_utterances"] = len(transcript_lines)
-    evaluation["agent_utterances"] = sum(1 for l in transcript_lines if l["speaker"] == "Agent")
-    evaluation["customer_utterances"] = sum(1 for l in transcript_lines if l["speaker"] == "Customer")
-
+    evaluation["agent_utterances"] = analytics["utterances"].get("Agent", 0)
+    evaluation["customer_utterances"] = analytics["utterances"].get("Customer", 0)
+    evaluation["analytics"] = analytics
     return evaluation
 
 
+def _format_call_facts(analytics: dict, call_duration: float, intent: str | None, member: dict | None) -> str:
+    talk = analytics["talk_time_seconds"]
+    ratio = analytics["agent_talk_ratio"]
+    latency = analytics["agent_response_latency_seconds"]
+    checklist = analytics["checklist"]
+    estimated = " (estimated)" if analytics["timing_estimated"] else ""
+
+    facts = [
+        f"- Claim type: {intent or 'unknown'}; policyholder: {member.get('name') if member else 'not identified'}",
+        f"- Duration {int(call_duration)} s; talk time{estimated} Agent {talk.get('Agent', 0)} s, "
+        f"Customer {talk.get('Customer', 0)} s" + (f" (agent {ratio:.0%})" if ratio is not None else ""),
+        f"- Silence {analytics['silence_seconds']} s ({analytics['long_silences']} gaps over 5 s); "
+        f"overlap {analytics['overlap_seconds']} s; agent interruptions {analytics['agent_interruptions']}",
+    ]
+    if latency:
+        facts.append(
+            f"- Agent response latency: mean {latency['mean']} s, p90 {latency['p90']} s, "
+            f"max {latency['max']} s over {latency['turns']} turns"
+        )
+    total = len(checklist["covered"]) + len(checklist["missing"])
+    facts.append(
+        f"- FNOL checklist: {len(checklist['covered'])}/{total} covered"
+        + (f"; missing: {', '.join(checklist['missing'])}" if checklist["missing"] else "")
+    )
+    unmet = analytics["unmet_compliance_obligations"]
+    facts.append(f"- Compliance obligations not met: {', '.join(unmet) if unmet else 'none'}")
+    return "\n".join(facts)
+
+
 def _format_docs(docs: list[dict] | None) -> str:
     if not docs:
         return "None found"
     return "\n".join(f"- {d['title']}: {d['content'][:200]}..." for d in docs)
 
 
+def _format_candidates(candidates: list[dict] | None) -> str:
+    if not candidates:
+        return "Not yet identified"
+    matches = ", ".join(f"{c['name']} ({c['policyId']}, score {c['score']})" for c in candidates)
+    return f"Not yet identified — possible matches: {matches}"
+
+
 def _format_alerts(alerts: list[dict] | None) -> str:
     if not alerts:
         return "None"
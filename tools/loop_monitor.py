@@ -0,0 +1,164 @@
+# tools/loop_monitor.py — Event-loop lag histogram, stall watchdog, and on-demand stack sampling
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+logger = logging.getLogger("call-intelligence")
+
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+LOOP_STALL_MS = float(os.getenv("LOOP_STALL_MS", "100"))
+
+# Upper bounds (ms) of the lag histogram buckets; the last bucket is open-ended
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up, and reports what blocked it.
+
+    A ticker coroutine sleeps for a fixed interval and records how much later
+    than scheduled it actually resumed — that lag is the time every other
+    callback on this worker also spent waiting. Each tick also stamps a
+    heartbeat; a watchdog thread that sees the heartbeat go stale for longer
+    than LOOP_STALL_MS logs the loop thread's current stack once per stall, so
+    the offending synchronous code shows up by name while it is still running.
+    """
+
+    def __init__(self, interval_ms: float = LOOP_MONITOR_INTERVAL_MS, stall_ms: float = LOOP_STALL_MS):
+        self.interval = interval_ms / 1000
+        self.stall = stall_ms / 1000
+        self.buckets = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    @property
+    def loop_thread_id(self) -> int | None:
+        return self._loop_thread_id
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+
+    def record(self, lag: float) -> None:
+        lag_ms = lag * 1000
+        for i, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.record(max(now - expected, 0.0))
+
+    def _watch(self):
+        reported_for = None
+        while not self._stop.wait(self.stall / 2):
+            beat = self._heartbeat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.stall or reported_for == beat:
+                continue
+            reported_for = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "  <loop thread not found>\n"
+            logger.warning(f"🐢 Event loop blocked for {blocked * 1000:.0f} ms+, currently in:\n{stack}")
+
+    def _quantile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        target = q * self.samples
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return LAG_BUCKETS_MS[i] if i < len(LAG_BUCKETS_MS) else round(self.max_lag * 1000, 1)
+        return round(self.max_lag * 1000, 1)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b}ms" for b in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"]
+        return {
+            "samples": self.samples,
+            "mean_ms": round(self.total_lag / self.samples * 1000, 2) if self.samples else None,
+            "p50_ms": self._quantile(0.5),
+            "p99_ms": self._quantile(0.99),
+            "max_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stalls,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+# ═══════════════════════════════════════════════════════
+# SAMPLING PROFILER — collapsed stacks for flame graphs
+# ═══════════════════════════════════════════════════════
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def sample_stacks(seconds: float, hz: float = 100, thread_id: int | None = None) -> str:
+    """
+    Samples thread stacks for `seconds` and returns them in the collapsed format
+    ("outer;inner;leaf count" per line) read by flamegraph.pl and speedscope.
+    With thread_id, only that thread is sampled; otherwise every thread except
+    the sampler itself, each stack prefixed with its thread name.
+    Runs on the calling thread — call it from a worker thread, not the loop.
+    """
+    me = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    counts: Counter[str] = Counter()
+    interval = 1 / hz
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me or (thread_id is not None and ident != thread_id):
+                continue
+            stack = _collapse(frame)
+            if thread_id is None:
+                stack = f"{names.get(ident, ident)};{stack}"
+            counts[stack] += 1
+        time.sleep(interval)
+
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
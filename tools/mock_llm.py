@@ -0,0 +1,356 @@
+# tools/mock_llm.py — Deterministic offline stand-in for the OpenAI chat completions API
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from types import SimpleNamespace
+
+
+# ═══════════════════════════════════════════════════════
+# SETTINGS — latency distribution, 429 rate, streaming speed
+# ═══════════════════════════════════════════════════════
+
+class LatencyModel:
+    """
+    Samples simulated model latency (seconds) from a spec string:
+        "fixed:120"            → always 120 ms
+        "uniform:50:400"       → uniform between 50 and 400 ms
+        "normal:300:80"        → mean 300 ms, stddev 80 ms (clamped at 0)
+        "lognormal:300:0.6"    → median 300 ms, sigma 0.6 (long tail, like real APIs)
+    """
+
+    def __init__(self, kind: str = "fixed", params: tuple[float, ...] = (0.0,)):
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def from_spec(cls, spec: str | None) -> "LatencyModel":
+        if not spec:
+            return cls()
+        kind, _, rest = spec.partition(":")
+        params = tuple(float(p) for p in rest.split(":") if p) or (0.0,)
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind!r}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "uniform":
+            ms = rng.uniform(p[0], p[1] if len(p) > 1 else p[0])
+        elif self.kind == "normal":
+            ms = rng.gauss(p[0], p[1] if len(p) > 1 else 0.0)
+        elif self.kind == "lognormal":
+            ms = p[0] * rng.lognormvariate(0.0, p[1] if len(p) > 1 else 0.5)
+        else:
+            ms = p[0]
+        return max(ms, 0.0) / 1000
+
+
+class MockSettings:
+    """
+    Mock behaviour, read from MOCK_LLM_* environment variables by default.
+    MOCK_LLM_MODELS overrides any of them per model, to simulate one slow or
+    failing backend next to a healthy one, e.g.
+        MOCK_LLM_MODELS='{"gpt-4.1-mini": {"latency": "fixed:4000"}, "gpt-4.1-nano": {"error_rate": 0.3}}'
+    """
+
+    def __init__(
+        self,
+        latency: str | None = None,
+        rate_limit: float | None = None,
+        error_rate: float | None = None,
+        tokens_per_sec: float | None = None,
+        seed: int | None = None,
+        models: dict[str, dict] | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.latency_spec = latency if latency is not None else os.getenv("MOCK_LLM_LATENCY", "fixed:0")
+        self.latency = LatencyModel.from_spec(self.latency_spec)
+        self.rate_limit = rate_limit if rate_limit is not None else float(os.getenv("MOCK_LLM_RATE_LIMIT", "0"))
+        self.error_rate = error_rate if error_rate is not None else float(os.getenv("MOCK_LLM_ERROR_RATE", "0"))
+        self.tokens_per_sec = tokens_per_sec if tokens_per_sec is not None else float(os.getenv("MOCK_LLM_TOKENS_PER_SEC", "0"))
+        self.rng = rng or random.Random(seed if seed is not None else int(os.getenv("MOCK_LLM_SEED", "0")))
+        if models is None:
+            models = json.loads(os.getenv("MOCK_LLM_MODELS", "{}"))
+        self._models = {
+            name: MockSettings(
+                latency=cfg.get("latency", self.latency_spec),
+                rate_limit=cfg.get("rate_limit", self.rate_limit),
+                error_rate=cfg.get("error_rate", self.error_rate),
+                tokens_per_sec=cfg.get("tokens_per_sec", self.tokens_per_sec),
+                models={},
+                rng=self.rng,
+            )
+            for name, cfg in models.items()
+        }
+
+    def for_model(self, model: str) -> "MockSettings":
+        return self._models.get(model, self)
+
+    def sample_latency(self) -> float:
+        return self.latency.sample(self.rng)
+
+    def should_rate_limit(self) -> bool:
+        return self.rate_limit > 0 and self.rng.random() < self.rate_limit
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+    def token_delay(self) -> float:
+        return 1 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+
+# ═══════════════════════════════════════════════════════
+# DETERMINISTIC PAYLOADS — keyed by structured-output schema name
+# ═══════════════════════════════════════════════════════
+
+_INTENT_KEYWORDS = [
+    ("life_accidental_death", ("accidental death", "died in an accident", "killed in")),
+    ("life_death_claim", ("passed away", "died", "death", "deceased", "life insurance")),
+    ("car_theft", ("stolen", "stole", "theft")),
+    ("car_vandalism", ("vandal", "keyed", "graffiti", "smashed window", "broke the window")),
+    ("car_accident", ("accident", "collision", "crash", "rear-ended", "hit my", "towing")),
+]
+
+_CLAIM_TYPES = {
+    "car_accident": "car_insurance",
+    "car_theft": "car_insurance",
+    "car_vandalism": "car_insurance",
+    "life_death_claim": "life_insurance",
+    "life_accidental_death": "life_insurance",
+    "general_inquiry": "general",
+}
+
+_POLICY_RE = re.compile(r"\b(CAR|LIFE)[-\s]?(\d{4,})\b", re.IGNORECASE)
+_PHONE_RE = re.compile(r"\+?\d[\d\s-]{8,}\d")
+_NAME_RE = re.compile(r"\b(?:my name is|this is|i am|i'm)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)")
+
+
+def _last_user_message(messages: list[dict]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content") or ""
+    return ""
+
+
+def _classify(text: str) -> dict:
+    lower = text.lower()
+    for intent, keywords in _INTENT_KEYWORDS:
+        if any(k in lower for k in keywords):
+            return {"intent": intent, "claim_type": _CLAIM_TYPES[intent]}
+    return {"intent": "general_inquiry", "claim_type": "general"}
+
+
+def _extract(text: str) -> dict:
+    policy = _POLICY_RE.search(text)
+    phone = _PHONE_RE.search(text)
+    name = _NAME_RE.search(text)
+    return {
+        "policy_id": f"{policy.group(1).upper()}-{policy.group(2)}" if policy else None,
+        "name": name.group(1) if name else None,
+        "phone": phone.group(0).strip() if phone else None,
+    }
+
+
+def _score(value: int, feedback: str) -> dict:
+    return {"score": max(1, min(value, 10)), "feedback": feedback}
+
+
+def _evaluate(prompt: str) -> dict:
+    lines = [l for l in prompt.splitlines() if l[:3] in ("A: ", "C: ")]
+    agent = " ".join(l for l in lines if l.startswith("A: ")).lower()
+
+    empathy = 5 + 3 * any(w in agent for w in ("sorry", "understand", "glad you"))
+    gathering = 4 + sum(w in agent for w in ("police", "date", "where", "policy", "injur"))
+    compliance = 5 + 3 * ("record" in agent) + 2 * ("fault" in agent)
+    process = 6 + 2 * any(w in agent for w in ("claim", "coverage", "deductible"))
+    resolution = 5 + 3 * any(w in agent for w in ("next", "tow", "adjuster", "follow"))
+    scores = {
+        "empathy_and_tone": _score(empathy, "Mock evaluation: empathy cues detected." if empathy > 5 else "Mock evaluation: no empathy cues."),
+        "information_gathering": _score(gathering, "Mock evaluation: keyword-based FNOL coverage."),
+        "compliance_adherence": _score(compliance, "Mock evaluation: recording/fault advisories checked."),
+        "process_knowledge": _score(process, "Mock evaluation: process terms checked."),
+        "resolution_and_next_steps": _score(resolution, "Mock evaluation: next-step cues checked."),
+    }
+    overall = sum(s["score"] for s in scores.values()) * 2
+    claim = _classify(prompt)["claim_type"]
+
+    return {
+        "overall_score": max(1, min(overall, 100)),
+        "call_summary": f"Mock summary of a {len(lines)}-utterance {claim.replace('_', ' ')} call.",
+        "claim_type_detected": claim,
+        "scores": scores,
+        "strengths": ["Mock strength: call handled end to end."],
+        "improvements": ["Mock improvement: confirm all FNOL details explicitly."],
+        "compliance_violations": [] if compliance >= 8 else ["Mock violation: recording notice not detected."],
+        "coaching_notes": "Deterministic mock evaluation — no model was called.",
+    }
+
+
+def _suggest(prompt: str) -> str:
+    intent = re.search(r"Detected Intent:\s*(\S+)", prompt)
+    name = re.search(r"'name':\s*'([^']+)'", prompt)
+    greeting = f"Hi {name.group(1).split()[0]}, " if name else "Hi, "
+    topic = (intent.group(1) if intent else "unknown").replace("_", " ")
+    return (
+        f"{greeting}I'm sorry to hear about this and I'm here to help. "
+        f"Let's get your {topic} claim started — could you confirm your policy number "
+        "and tell me when and where this happened?"
+    )
+
+
+def _from_json_schema(schema: dict, defs: dict) -> object:
+    """Build the smallest instance that validates against a (strict) JSON schema."""
+    if "$ref" in schema:
+        return _from_json_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "anyOf" in schema:
+        options = schema["anyOf"]
+        if any(o.get("type") == "null" for o in options):
+            return None
+        return _from_json_schema(options[0], defs)
+    kind = schema.get("type")
+    if kind == "object":
+        return {k: _from_json_schema(v, defs) for k, v in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind == "integer":
+        return max(int(schema.get("minimum", 1)), 1)
+    if kind == "number":
+        return 0.0
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return ""
+
+
+_BUILDERS = {
+    "IntentClassification": _classify,
+    "EntityExtraction": _extract,
+    "PostCallEvaluation": _evaluate,
+}
+
+
+def build_payload(schema_name: str, messages: list[dict], json_schema: dict | None = None) -> dict:
+    """Deterministic, schema-valid payload for a structured-output request."""
+    builder = _BUILDERS.get(schema_name)
+    if builder:
+        return builder(_last_user_message(messages))
+    schema = json_schema or {}
+    return _from_json_schema(schema, schema.get("$defs", {}))
+
+
+def build_text(messages: list[dict]) -> str:
+    """Deterministic free-text completion (agent suggestions)."""
+    return _suggest(_last_user_message(messages))
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, close enough for load modelling."""
+    return max(1, len(text) // 4)
+
+
+def usage_for(messages: list[dict], content: str) -> dict:
+    prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+    completion_tokens = estimate_tokens(content)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def completion_id(messages: list[dict]) -> str:
+    digest = hashlib.sha1(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+    return f"chatcmpl-mock-{digest[:16]}"
+
+
+def stream_pieces(content: str) -> list[str]:
+    """Split a completion into word-sized deltas for simulated streaming."""
+    return re.findall(r"\S+\s*|\s+", content) or [content]
+
+
+# ═══════════════════════════════════════════════════════
+# IN-PROCESS CLIENT — same surface as AsyncOpenAI for our calls
+# ═══════════════════════════════════════════════════════
+
+def _status_error(status: int):
+    import httpx
+    from openai import InternalServerError, RateLimitError
+
+    response = httpx.Response(
+        status,
+        request=httpx.Request("POST", "http://mock-llm/v1/chat/completions"),
+        headers={"retry-after": "1"},
+    )
+    if status == 429:
+        return RateLimitError("Mock rate limit exceeded", response=response, body=None)
+    return InternalServerError("Mock server error", response=response, body=None)
+
+
+class _Completions:
+    def __init__(self, settings: MockSettings):
+        self._settings = settings
+
+    async def _admit(self, model: str):
+        settings = self._settings.for_model(model)
+        if settings.should_rate_limit():
+            raise _status_error(429)
+        await asyncio.sleep(settings.sample_latency())
+        if settings.should_fail():
+            raise _status_error(500)
+
+    def _response(self, model: str, messages: list[dict], content: str, parsed=None):
+        message = SimpleNamespace(role="assistant", content=content, parsed=parsed, refusal=None)
+        return SimpleNamespace(
+            id=completion_id(messages),
+            model=model,
+            created=int(time.time()),
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=SimpleNamespace(**usage_for(messages, content)),
+        )
+
+    async def create(self, *, model: str, messages: list[dict], stream: bool = False, **_):
+        await self._admit(model)
+        content = build_text(messages)
+        if stream:
+            return self._stream(model, messages, content)
+        return self._response(model, messages, content)
+
+    async def parse(self, *, model: str, messages: list[dict], response_format, **_):
+        await self._admit(model)
+        payload = build_payload(response_format.__name__, messages, response_format.model_json_schema())
+        parsed = response_format.model_validate(payload)
+        return self._response(model, messages, json.dumps(payload), parsed=parsed)
+
+    async def _stream(self, model: str, messages: list[dict], content: str):
+        delay = self._settings.for_model(model).token_delay()
+        for piece in stream_pieces(content):
+            if delay:
+                await asyncio.sleep(delay)
+            delta = SimpleNamespace(role="assistant", content=piece)
+            yield SimpleNamespace(
+                id=completion_id(messages),
+                model=model,
+                choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None)],
+            )
+
+
+class MockAsyncClient:
+    """
+    Drop-in replacement for AsyncOpenAI covering the calls tools/llm.py makes:
+    chat.completions.create (incl. stream=True) and (beta.)chat.completions.parse.
+    No network, deterministic payloads; latency/429s configurable via MockSettings.
+    """
+
+    def __init__(self, settings: MockSettings | None = None):
+        self.settings = settings or MockSettings()
+        completions = _Completions(self.settings)
+        self.chat = SimpleNamespace(completions=completions)
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=completions))
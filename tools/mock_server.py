@@ -0,0 +1,113 @@
+# tools/mock_server.py — Local OpenAI-compatible mock server for load tests and offline CI
+#
+# Run:   python -m tools.mock_server            (listens on :8001)
+# Use:   OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=mock python main.py
+#
+# Behaviour is controlled with the same MOCK_LLM_* variables as tools/mock_llm.py:
+#   MOCK_LLM_LATENCY="lognormal:300:0.6"  MOCK_LLM_RATE_LIMIT=0.05  MOCK_LLM_TOKENS_PER_SEC=80
+#   MOCK_LLM_ERROR_RATE=0.1  MOCK_LLM_MODELS='{"gpt-4.1-mini": {"latency": "fixed:4000"}}'
+
+import asyncio
+import json
+import os
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from tools.mock_llm import (
+    MockSettings,
+    build_payload,
+    build_text,
+    completion_id,
+    stream_pieces,
+    usage_for,
+)
+
+settings = MockSettings()
+
+app = FastAPI(title="Mock LLM", description="Deterministic OpenAI-compatible stand-in", version="1.0.0")
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "mock")
+    messages = body.get("messages", [])
+    model_settings = settings.for_model(model)
+
+    if model_settings.should_rate_limit():
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": "1"},
+            content={"error": {
+                "message": "Mock rate limit exceeded",
+                "type": "rate_limit_error",
+                "code": "rate_limit_exceeded",
+            }},
+        )
+
+    await asyncio.sleep(model_settings.sample_latency())
+
+    if model_settings.should_fail():
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Mock server error", "type": "server_error", "code": None}},
+        )
+
+    # Structured outputs (client.beta.chat.completions.parse) send a json_schema response_format
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        spec = response_format.get("json_schema", {})
+        content = json.dumps(build_payload(spec.get("name", ""), messages, spec.get("schema")))
+    else:
+        content = build_text(messages)
+
+    if body.get("stream"):
+        return StreamingResponse(_sse(model, messages, content, model_settings), media_type="text/event-stream")
+
+    return {
+        "id": completion_id(messages),
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content, "refusal": None},
+            "logprobs": None,
+            "finish_reason": "stop",
+        }],
+        "usage": usage_for(messages, content),
+    }
+
+
+async def _sse(model: str, messages: list[dict], content: str, model_settings: MockSettings):
+    """Emit the completion as OpenAI-style server-sent event chunks."""
+    delay = model_settings.token_delay()
+    base = {"id": completion_id(messages), "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+
+    for piece in stream_pieces(content):
+        if delay:
+            await asyncio.sleep(delay)
+        chunk = {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+
+    final = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("MOCK_LLM_PORT", "8001")))
@@ -0,0 +1,233 @@
+# tools/pubsub.py — In-process fan-out of live call events to supervisor sockets
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("call-intelligence")
+
+# Pending events per supervisor. Coalescing keeps at most one per (call, event type),
+# so ~4 × live calls per worker never drops anything.
+SUPERVISOR_BUFFER = int(os.getenv("SUPERVISOR_BUFFER", "2048"))
+
+SEVERITY_ORDER = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+
+class CallEvent:
+    """
+    One thing that happened on one call. The JSON frame is built on first
+    delivery and then shared by every subscriber that receives it.
+    """
+
+    __slots__ = ("call_id", "type", "agent", "intent", "severity", "data", "ts", "_frame")
+
+    def __init__(self, call_id: str, type: str, data, agent: str | None, intent: str | None, severity: str | None):
+        self.call_id = call_id
+        self.type = type
+        self.agent = agent
+        self.intent = intent
+        self.severity = severity
+        self.data = data
+        self.ts = time.time()
+        self._frame: str | None = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.call_id, self.type
+
+    @property
+    def frame(self) -> str:
+        if self._frame is None:
+            self._frame = json.dumps({
+                "type": self.type,
+                "call_id": self.call_id,
+                "agent": self.agent,
+                "intent": self.intent,
+                "ts": self.ts,
+                "data": self.data,
+            })
+        return self._frame
+
+
+class Subscription:
+    """
+    A supervisor's filtered view, with a bounded buffer.
+
+    Events are state, not history: a newer event of the same type for the
+    same call replaces the one still waiting in the buffer, so a slow
+    consumer receives the latest intent/alerts/suggestion per call instead of
+    a backlog. If the buffer is full of distinct calls, the oldest is dropped.
+
+    The subscription remembers which calls, and which state of each, it has
+    handed out, so a view never goes stale when an update stops matching its
+    filters: if the call's intent moves out of the filter it gets a "call"
+    event with status "removed" (drop the call), and if only this event type
+    no longer qualifies (alerts fell below min_severity) it gets that type
+    with "data": null (drop that state). A call that comes back into the
+    view is rebuilt from the hub's retained events.
+    """
+
+    def __init__(
+        self,
+        intents: set[str] | None = None,
+        min_severity: str | None = None,
+        agents: set[str] | None = None,
+        max_buffer: int = SUPERVISOR_BUFFER,
+    ):
+        self.intents = intents
+        self.min_severity = SEVERITY_ORDER.get(min_severity) if min_severity else None
+        self.agents = agents
+        self.max_buffer = max_buffer
+        self.coalesced = 0
+        self.dropped = 0
+        self._pending: OrderedDict[tuple[str, str], CallEvent] = OrderedDict()
+        self._held: dict[str, set[str]] = {}
+        self._ready = asyncio.Event()
+
+    def matches(self, event: CallEvent) -> bool:
+        if self.agents is not None and event.agent not in self.agents:
+            return False
+        # Call lifecycle events pass the intent/severity filters so a view never keeps ended calls
+        if event.type == "call":
+            return True
+        if self.intents is not None and event.intent not in self.intents:
+            return False
+        if self.min_severity is not None and event.type == "compliance":
+            return SEVERITY_ORDER.get(event.severity, -1) >= self.min_severity
+        return True
+
+    def deliver(self, event: CallEvent) -> bool:
+        """
+        Offer the event if it matches; otherwise retract whatever it supersedes.
+        Returns True (and offers nothing) when the event brings a call into a
+        view that doesn't hold it: the hub then replays the call's retained state.
+        """
+        if not self.matches(event):
+            self._retract(event)
+            return False
+        if event.type == "call":
+            if event.data.get("status") == "ended":
+                self._held.pop(event.call_id, None)
+            else:
+                self._held.setdefault(event.call_id, set()).add("call")
+            self.offer(event)
+            return False
+        held = self._held.get(event.call_id)
+        if held is None:
+            self._held[event.call_id] = set()
+            return True
+        held.add(event.type)
+        self.offer(event)
+        return False
+
+    def _retract(self, event: CallEvent) -> None:
+        held = self._held.get(event.call_id)
+        if not held:
+            return
+        if self.intents is not None and event.intent not in self.intents:
+            del self._held[event.call_id]
+            for key in [k for k in self._pending if k[0] == event.call_id]:
+                del self._pending[key]
+            self.offer(CallEvent(event.call_id, "call", {"status": "removed"}, event.agent, event.intent, None))
+        elif event.type in held:
+            held.discard(event.type)
+            self.offer(CallEvent(event.call_id, event.type, None, event.agent, event.intent, None))
+
+    def offer(self, event: CallEvent) -> None:
+        key = event.key
+        if key in self._pending:
+            self.coalesced += 1
+            del self._pending[key]
+        elif len(self._pending) >= self.max_buffer:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = event
+        self._ready.set()
+
+    async def next_frame(self) -> str:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        _, event = self._pending.popitem(last=False)
+        return event.frame
+
+
+class EventHub:
+    """
+    Calls publish each event once; every matching subscriber gets the same
+    CallEvent (and so the same serialized frame). The latest event of each
+    type per live call is retained so a supervisor who connects mid-call
+    starts from the current picture.
+    """
+
+    def __init__(self):
+        self._subscribers: set[Subscription] = set()
+        # call_id → event type → latest event, in publish order (the "call" event first)
+        self._retained: dict[str, dict[str, CallEvent]] = {}
+        self.published = 0
+
+    def subscribe(self, **filters) -> Subscription:
+        sub = Subscription(**filters)
+        for events in self._retained.values():
+            current = events.get("intent")
+            if current is not None and sub.intents is not None and current.intent not in sub.intents:
+                continue  # outside this view for now; it is replayed if the intent comes back
+            for event in list(events.values()):
+                self._deliver(sub, event)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(
+        self,
+        call_id: str,
+        type: str,
+        data,
+        agent: str | None = None,
+        intent: str | None = None,
+        severity: str | None = None,
+    ) -> None:
+        event = CallEvent(call_id, type, data, agent, intent, severity)
+        retained = self._retained.setdefault(call_id, {})
+        if intent is not None:
+            # Retained state follows the call's intent, so a replay is filtered by where the call is now
+            for other in retained.values():
+                if other.intent != intent:
+                    other.intent = intent
+                    other._frame = None
+        retained[type] = event
+        self._fan_out(event)
+
+    def end_call(self, call_id: str, data: dict, agent: str | None = None, intent: str | None = None) -> None:
+        """Announce the end of a call and forget its retained state."""
+        self._retained.pop(call_id, None)
+        self._fan_out(CallEvent(call_id, "call", {**data, "status": "ended"}, agent, intent, None))
+
+    def _fan_out(self, event: CallEvent) -> None:
+        self.published += 1
+        for sub in self._subscribers:
+            self._deliver(sub, event)
+
+    def _deliver(self, sub: Subscription, event: CallEvent) -> None:
+        if sub.deliver(event):
+            # The call (re-)entered this view: rebuild it from the retained state
+            for retained in list(self._retained.get(event.call_id, {}).values()):
+                sub.deliver(retained)
+
+    def snapshot(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "live_calls": sum(1 for events in self._retained.values() if "call" in events),
+            "published": self.published,
+            "coalesced": sum(s.coalesced for s in self._subscribers),
+            "dropped": sum(s.dropped for s in self._subscribers),
+        }
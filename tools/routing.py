@@ -0,0 +1,153 @@
+# tools/routing.py — Per-task model routing with latency/error tracking, failover and deadlines
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+logger = logging.getLogger("call-intelligence")
+
+# Task → ordered candidates (primary first) plus latency targets.
+# A candidate is a model name or {"model": ..., "base_url": ..., "api_key_env": ...}.
+# Override with LLM_ROUTES (inline JSON or a path to a JSON file); tasks not listed keep these.
+DEFAULT_ROUTES = {
+    "intent": {"models": ["gpt-4.1-mini", "gpt-4.1-nano"], "deadline_ms": 4000, "p95_budget_ms": 1500},
+    "entities": {"models": ["gpt-4.1-mini", "gpt-4.1-nano"], "deadline_ms": 4000, "p95_budget_ms": 1500},
+    "suggestion": {"models": ["gpt-4.1-mini", "gpt-4.1-nano"], "deadline_ms": 5000, "p95_budget_ms": 3000},
+    "evaluation": {"models": ["gpt-4.1-mini", "gpt-4.1"], "deadline_ms": 60000, "p95_budget_ms": 25000},
+}
+
+WINDOW_SECONDS = 60.0
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.5
+
+
+class LLMDeadlineExceeded(Exception):
+    """No route answered within the task's deadline."""
+
+
+def load_routes() -> dict:
+    routes = {task: dict(cfg) for task, cfg in DEFAULT_ROUTES.items()}
+    raw = os.getenv("LLM_ROUTES", "").strip()
+    if raw:
+        if not raw.startswith("{"):
+            with open(raw, "r", encoding="utf-8") as f:
+                raw = f.read()
+        for task, cfg in json.loads(raw).items():
+            routes[task] = {**routes.get(task, {}), **cfg}
+    return routes
+
+
+class Route:
+    """One model on one endpoint, with a rolling window of recent outcomes."""
+
+    def __init__(self, spec: str | dict):
+        spec = {"model": spec} if isinstance(spec, str) else spec
+        self.model: str = spec["model"]
+        self.base_url: str | None = spec.get("base_url")
+        self.api_key_env: str | None = spec.get("api_key_env")
+        self._samples: deque[tuple[float, float, bool]] = deque(maxlen=200)
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}@{self.base_url or 'default'}"
+
+    def record(self, latency: float, ok: bool) -> None:
+        self._samples.append((time.monotonic(), latency, ok))
+
+    def _recent(self) -> list[tuple[float, float, bool]]:
+        cutoff = time.monotonic() - WINDOW_SECONDS
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return list(self._samples)
+
+    def stats(self) -> dict:
+        recent = self._recent()
+        # Failures count at their elapsed time, so timeouts push p95 up as they should
+        latencies = sorted(s[1] for s in recent)
+        errors = sum(1 for s in recent if not s[2])
+        return {
+            "samples": len(recent),
+            "p95_ms": round(latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)] * 1000) if latencies else None,
+            "error_rate": round(errors / len(recent), 3) if recent else 0.0,
+        }
+
+    def healthy(self, p95_budget_ms: float) -> bool:
+        s = self.stats()
+        if s["samples"] < MIN_SAMPLES:
+            return True
+        return s["error_rate"] <= MAX_ERROR_RATE and s["p95_ms"] <= p95_budget_ms
+
+
+class _Task:
+    def __init__(self, cfg: dict):
+        self.routes = [Route(spec) for spec in cfg["models"]]
+        self.deadline = cfg.get("deadline_ms", 10000) / 1000
+        self.p95_budget_ms = cfg.get("p95_budget_ms", cfg.get("deadline_ms", 10000))
+
+
+class ModelRouter:
+    """
+    Picks a model per task and fails over when the current one is slow or failing.
+
+    Healthy routes are tried in configured order, unhealthy ones after them.
+    Every attempt except the last is cut off at the task's p95 budget so a
+    stalled primary leaves time for the alternate; the whole call is bounded by
+    the task deadline. If every route errors, the last error is re-raised
+    (status codes such as 429 still reach the caller).
+    """
+
+    def __init__(self, routes: dict, client_for: Callable[[Route], object]):
+        self._tasks = {task: _Task(cfg) for task, cfg in routes.items()}
+        self._client_for = client_for
+
+    def primary_model(self, task: str) -> str:
+        return self._tasks[task].routes[0].model
+
+    def _ordered(self, task: _Task) -> list[Route]:
+        healthy = [r for r in task.routes if r.healthy(task.p95_budget_ms)]
+        return healthy + [r for r in task.routes if r not in healthy]
+
+    async def run(self, task_name: str, call: Callable[[object, str], Awaitable]):
+        task = self._tasks[task_name]
+        deadline = time.monotonic() + task.deadline
+        routes = self._ordered(task)
+        last_error: Exception | None = None
+
+        for i, route in enumerate(routes):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            is_last = i == len(routes) - 1
+            timeout = remaining if is_last else min(remaining, task.p95_budget_ms / 1000)
+
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(call(self._client_for(route), route.model), timeout)
+            except asyncio.TimeoutError:
+                route.record(time.monotonic() - started, ok=False)
+                logger.warning(f"⏱️ {task_name}: {route.key} exceeded {timeout * 1000:.0f} ms, failing over")
+                continue
+            except Exception as e:
+                route.record(time.monotonic() - started, ok=False)
+                logger.warning(f"⚠️ {task_name}: {route.key} failed ({e}), failing over")
+                last_error = e
+                continue
+            route.record(time.monotonic() - started, ok=True)
+            return result
+
+        if last_error is not None and time.monotonic() < deadline:
+            raise last_error
+        raise LLMDeadlineExceeded(f"{task_name}: no model answered within {task.deadline * 1000:.0f} ms")
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                route.key: {**route.stats(), "healthy": route.healthy(task.p95_budget_ms)}
+                for route in task.routes
+            }
+            for name, task in self._tasks.items()
+        }
@@ -0,0 +1,191 @@
+# tools/static_assets.py — Precompressed, cache-friendly serving of the built frontend (frontend/dist)
+#
+# Build-time precompression (optional — otherwise the server does it on a worker
+# thread once it is live, see PrecompressedStaticFiles.load):
+#   python -m tools.static_assets frontend/dist
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import sys
+import tempfile
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, PlainTextResponse, Response
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("call-intelligence")
+
+COMPRESSIBLE = (".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml", ".wasm")
+MIN_COMPRESS_SIZE = 1024
+
+# Vite emits content-hashed names like index-BpWx3_9a.js — safe to cache forever
+HASHED_NAME = re.compile(r"[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+# ═══════════════════════════════════════════════════════
+# PRECOMPRESSION
+# ═══════════════════════════════════════════════════════
+
+def _is_fresh(variant: str, source: str) -> bool:
+    return os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(source)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Readers (and other workers precompressing concurrently) only ever see a complete file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def precompress_file(path: str) -> None:
+    """Write path.gz (and path.br if brotli is installed) unless they are already up to date."""
+    if not path.endswith(COMPRESSIBLE) or os.path.getsize(path) < MIN_COMPRESS_SIZE:
+        return
+    data = None
+    if not _is_fresh(path + ".gz", path):
+        data = open(path, "rb").read()
+        # mtime=0 keeps the output byte-identical across rebuilds
+        _write_atomic(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli and not _is_fresh(path + ".br", path):
+        data = data or open(path, "rb").read()
+        _write_atomic(path + ".br", brotli.compress(data, quality=11))
+
+
+def _is_variant(name: str) -> bool:
+    return name.endswith((".gz", ".br", ".tmp"))
+
+
+def precompress_tree(directory: str) -> None:
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not _is_variant(name):
+                precompress_file(os.path.join(root, name))
+
+
+# ═══════════════════════════════════════════════════════
+# SERVING
+# ═══════════════════════════════════════════════════════
+
+class _Asset:
+    __slots__ = ("path", "media_type", "etag", "cache_control", "variants")
+
+    def __init__(self, path: str, immutable: bool):
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        self.path = path
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.etag = f'"{digest}"'
+        self.cache_control = IMMUTABLE if immutable else REVALIDATE
+        # Only keep a compressed variant if it actually saves bytes
+        size = os.path.getsize(path)
+        self.variants = {
+            encoding: (path + suffix, f'"{digest}-{encoding}"')
+            for encoding, suffix in _ENCODINGS
+            if os.path.exists(path + suffix) and os.path.getsize(path + suffix) < size
+        }
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:] or 0) == 0:
+                    continue
+            except ValueError:
+                pass  # malformed q-value: treat as the default q=1
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles:
+    """
+    Serves a build output directory.
+
+    Construction is free; load() precompresses (unless done at build time) and
+    indexes the files (content ETag, media type, precompressed siblings) and is
+    meant to run on a worker thread after the server is live. Until then files
+    are served uncompressed with no-cache. Once loaded, each request negotiates
+    br/gzip from Accept-Encoding, answers If-None-Match with 304, and marks
+    content-hashed filenames immutable. Bodies go out through FileResponse,
+    which hands the path to the server for zero-copy sendfile when it supports
+    the ASGI pathsend extension (Hypercorn, Granian) and streams in chunks
+    otherwise (uvicorn).
+    """
+
+    def __init__(self, directory: str, precompress: bool = True, immutable_hashed: bool = True):
+        self.directory = os.path.realpath(directory)
+        self.precompress = precompress
+        self.immutable_hashed = immutable_hashed
+        self._assets: dict[str, _Asset] | None = None
+
+    def load(self) -> None:
+        if self.precompress:
+            precompress_tree(self.directory)
+        assets = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if _is_variant(name):
+                    continue
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                assets[rel] = _Asset(path, self.immutable_hashed and bool(HASHED_NAME.search(name)))
+        self._assets = assets
+        logger.info(
+            f"📦 Indexed {len(assets)} static files in {self.directory} "
+            f"({'gzip+br' if brotli else 'gzip'})"
+        )
+
+    def _unindexed(self, rel_path: str) -> Response:
+        path = os.path.realpath(os.path.join(self.directory, rel_path))
+        if not path.startswith(self.directory + os.sep) or _is_variant(path) or not os.path.isfile(path):
+            return PlainTextResponse("Not Found", status_code=404)
+        return FileResponse(path, headers={"cache-control": REVALIDATE})
+
+    def response(self, request: Request, rel_path: str) -> Response:
+        if self._assets is None:
+            return self._unindexed(rel_path.lstrip("/"))
+        asset = self._assets.get(rel_path.lstrip("/"))
+        if asset is None:
+            return PlainTextResponse("Not Found", status_code=404)
+
+        path, etag, encoding = asset.path, asset.etag, None
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        for candidate in ("br", "gzip"):
+            if candidate in accepted and candidate in asset.variants:
+                path, etag = asset.variants[candidate]
+                encoding = candidate
+                break
+
+        headers = {"cache-control": asset.cache_control, "etag": etag, "vary": "Accept-Encoding"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["content-encoding"] = encoding
+        return FileResponse(path, media_type=asset.media_type, headers=headers)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join("frontend", "dist")
+    precompress_tree(target)
+    print(f"Precompressed {target} ({'gzip+br' if brotli else 'gzip only — pip install brotli for .br'})")
@@ -1,7 +1,7 @@
 from graph.graph import build_graph
 
 def export_graph_png(filename="call_graph.png"):
-    graph = build_graph()
+    graph = build_graph("langgraph")
     
     # Generate PNG bytes from Mermaid
     png_bytes = graph.get_graph().draw_mermaid_png()